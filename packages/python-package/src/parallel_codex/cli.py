@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import os
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 from . import __version__
@@ -68,6 +70,21 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return uvloop's loop factory if available, else ``None`` for the default loop.
+
+    uvloop is an optional speedup (see the ``speedups`` extra); it runs the
+    subprocess pipes to ``codex mcp-server`` on libuv instead of the pure-Python
+    selector loop.
+    """
+
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def main(argv: list[str] | None = None) -> int:
     """Parse CLI arguments and run the TUI."""
 
@@ -84,7 +101,16 @@ def main(argv: list[str] | None = None) -> int:
         show_log_panel=args.dev_log_panel,
     )
     app = ParallelCodexApp(config)
-    app.run()
+    loop_factory = _event_loop_factory()
+    if loop_factory is None:
+        app.run()
+        return 0
+
+    # Runner gives the custom loop the same teardown as asyncio.run(): leftover
+    # tasks are cancelled, and async generators and the default executor (used
+    # by asyncio.to_thread) are shut down before the loop closes.
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(app.run_async())
     return 0
 
 
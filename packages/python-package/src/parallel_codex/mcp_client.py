@@ -8,19 +8,61 @@ event loop.
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import shutil
+import signal
 import sys
+import time
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, NamedTuple
+
+try:  # Optional speedup: orjson parses/serializes JSON-RPC frames in native code.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    orjson = None  # type: ignore[assignment]
 
 LOG = logging.getLogger(__name__)
 
+# Size of each bulk read from the MCP server's stdout pipe.
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Requested kernel buffer size for the server's stdio pipes (Linux only).
+_PIPE_BUFFER_SIZE = 1024 * 1024
+
+# How long stop() lets the server's process group exit after SIGTERM before
+# killing what is left.
+_TERMINATE_GRACE_PERIOD = 2.0
+
+# Fixed ``tools/call`` envelope. Only the id, tool name, and arguments vary per
+# request, so the constant parts are serialized once instead of per call.
+_TOOL_CALL_FRAME = (
+    b'{"jsonrpc":"2.0","id":%d,"method":"tools/call",'
+    b'"params":{"name":%b,"arguments":%b}}\n'
+)
+# Pre-encoded names for the tools this client calls; other names fall back to
+# ``_dumps``.
+_TOOL_NAME_JSON = {"codex": b'"codex"', "codex-reply": b'"codex-reply"'}
+
+# A successful ``codex login status`` is trusted for this many seconds per CLI
+# path, so restarting or creating more clients does not spawn it again.
+_LOGIN_CHECK_TTL = 300.0
+_login_verified_until: dict[str, float] = {}
+
+# Most recent notifications kept per request timeline; older ones are dropped.
+_TIMELINE_NOTIFICATION_LIMIT = 512
+
+# Backlog limits for event queues whose consumer has fallen behind. Past the
+# limit a new progress event evicts the oldest queued progress event; other
+# events are always delivered.
+_GLOBAL_PROGRESS_BACKLOG = 4096
+_SESSION_PROGRESS_BACKLOG = 1024
+
 
 def ensure_codex_present() -> str:
     """Return the path to the `codex` CLI, or raise if not found.
@@ -33,8 +75,10 @@ def ensure_codex_present() -> str:
     if override:
         return override
 
-    path = shutil.which("codex")
+    path = _which_codex(os.environ.get("PATH"))
     if path is None:
+        # Do not remember the miss; codex may be installed before the next try.
+        _which_codex.cache_clear()
         raise RuntimeError(
             "The 'codex' CLI was not found on PATH. "
             "Install Codex and ensure the 'codex' command is available."
@@ -42,10 +86,29 @@ def ensure_codex_present() -> str:
     return path
 
 
-async def ensure_codex_logged_in() -> None:
-    """Raise RuntimeError if the current user is not logged into Codex."""
+@functools.lru_cache(maxsize=1)
+def _which_codex(search_path: str | None) -> str | None:
+    """Locate ``codex`` on PATH, memoized per PATH value.
+
+    ``search_path`` is only the cache key, so a changed PATH is searched again.
+    """
+
+    return shutil.which("codex")
+
+
+async def ensure_codex_logged_in(codex_path: str | None = None) -> None:
+    """Raise RuntimeError if the current user is not logged into Codex.
+
+    Callers that already resolved the CLI can pass ``codex_path`` to skip a
+    second ``PATH`` lookup. A successful check is remembered for a few
+    minutes; failures are never cached.
+    """
 
-    codex_path = ensure_codex_present()
+    if codex_path is None:
+        codex_path = ensure_codex_present()
+
+    if _login_verified_until.get(codex_path, 0.0) > time.monotonic():
+        return
 
     try:
         proc = await asyncio.create_subprocess_exec(
@@ -69,6 +132,7 @@ async def ensure_codex_logged_in() -> None:
             "Run `echo $OPENAI_API_KEY | codex login --with-api-key` and then "
             "`codex login status`."
         )
+    _login_verified_until[codex_path] = time.monotonic() + _LOGIN_CHECK_TTL
 
 
 class CodexEventType(str, Enum):
@@ -82,9 +146,12 @@ class CodexEventType(str, Enum):
     ERROR = "error"
 
 
-@dataclass(slots=True)
-class CodexEvent:
-    """A decoded event or response from the MCP server."""
+class CodexEvent(NamedTuple):
+    """A decoded event or response from the MCP server.
+
+    A ``NamedTuple`` rather than a dataclass: one is built per inbound
+    message, and tuple construction is cheaper than a Python ``__init__``.
+    """
 
     raw: dict[str, Any]
     session_id: str | None = None
@@ -95,8 +162,7 @@ class CodexEvent:
     timestamp: float = 0.0
 
 
-@dataclass(slots=True)
-class TrackedNotification:
+class TrackedNotification(NamedTuple):
     """Structured representation of an intermediate notification."""
 
     event_type: CodexEventType
@@ -118,14 +184,22 @@ class RequestTimeline:
     completed_at: float | None = None
     status: str = "pending"
     session_id: str | None = None
-    notifications: list[TrackedNotification] = field(default_factory=list)
+    # When False, notifications for this request are not recorded.
+    tracked: bool = True
+    # Bounded by CodexEventTracker, which creates timelines with its own limit.
+    notifications: deque[TrackedNotification] = field(default_factory=deque)
 
 
 class CodexEventTracker:
-    """Track notifications and responses grouped by request id."""
+    """Track notifications and responses grouped by request id.
 
-    def __init__(self) -> None:
+    Each timeline keeps at most ``max_notifications`` of the most recent
+    notifications so long-running sessions do not grow without bound.
+    """
+
+    def __init__(self, max_notifications: int = _TIMELINE_NOTIFICATION_LIMIT) -> None:
         self._timelines: dict[str, RequestTimeline] = {}
+        self._max_notifications = max_notifications
 
     # ------------------------------------------------------------------
     # Request lifecycle helpers
@@ -133,7 +207,10 @@ class CodexEventTracker:
     def _ensure_timeline(self, request_id: str) -> RequestTimeline:
         timeline = self._timelines.get(request_id)
         if timeline is None:
-            timeline = RequestTimeline(request_id=request_id)
+            timeline = RequestTimeline(
+                request_id=request_id,
+                notifications=deque(maxlen=self._max_notifications),
+            )
             self._timelines[request_id] = timeline
         return timeline
 
@@ -158,6 +235,14 @@ class CodexEventTracker:
         timeline = self._ensure_timeline(request_id)
         timeline.session_id = session_id
 
+    def set_tracked(self, request_id: str, tracked: bool) -> None:
+        """Enable or disable recording notifications for ``request_id``."""
+
+        timeline = self._ensure_timeline(request_id)
+        timeline.tracked = tracked
+        if not tracked:
+            timeline.notifications.clear()
+
     def track_notification(self, request_id: str, notification: TrackedNotification) -> None:
         timeline = self._ensure_timeline(request_id)
         timeline.notifications.append(notification)
@@ -196,28 +281,160 @@ class PendingCall:
     future: asyncio.Future[dict[str, Any]]
 
 
-class CodexMCP:
-    """Async client for a single ``codex mcp-server`` subprocess."""
+class _EventBuffer:
+    """FIFO of queued events that can drop its oldest progress event in O(1).
+
+    Events are held in one-item slots. Progress slots are also indexed in a
+    second deque, so eviction empties the oldest progress slot in place and
+    ``popleft`` skips emptied slots instead of deleting from the middle.
+    """
+
+    __slots__ = ("_slots", "_progress", "_live")
 
     def __init__(self) -> None:
+        self._slots: deque[list[CodexEvent | None]] = deque()
+        self._progress: deque[list[CodexEvent | None]] = deque()
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __iter__(self) -> Iterator[CodexEvent]:
+        return (slot[0] for slot in self._slots if slot[0] is not None)
+
+    def append(self, event: CodexEvent) -> None:
+        slot: list[CodexEvent | None] = [event]
+        self._slots.append(slot)
+        if event.event_type is CodexEventType.PROGRESS:
+            self._progress.append(slot)
+        self._live += 1
+
+    def popleft(self) -> CodexEvent:
+        while True:
+            event = self._slots.popleft()[0]
+            if event is not None:
+                break
+        if event.event_type is CodexEventType.PROGRESS:
+            # Evicted slots leave the index as they are emptied, so the oldest
+            # live progress slot is always at its head.
+            self._progress.popleft()
+        self._live -= 1
+        return event
+
+    def tail(self) -> CodexEvent | None:
+        return self._slots[-1][0] if self._slots else None
+
+    def replace_tail(self, event: CodexEvent) -> None:
+        # Callers replace progress with progress, so the slot stays indexed.
+        self._slots[-1][0] = event
+
+    def evict_oldest_progress(self) -> bool:
+        if not self._progress:
+            return False
+        self._progress.popleft()[0] = None
+        self._live -= 1
+        return True
+
+
+class _EventQueue(asyncio.Queue[CodexEvent]):
+    """Unbounded event queue whose oldest progress event can be evicted."""
+
+    _queue: _EventBuffer
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = _EventBuffer()
+
+    def _put(self, item: CodexEvent) -> None:
+        self._queue.append(item)
+
+    def _get(self) -> CodexEvent:
+        return self._queue.popleft()
+
+    def evict_oldest_progress(self) -> bool:
+        """Remove the oldest queued progress event, if there is one."""
+
+        if not self._queue.evict_oldest_progress():
+            return False
+        # Balance the put() that queued it, as get() + task_done() would.
+        self.task_done()
+        return True
+
+
+class _ProgressCoalescingQueue(_EventQueue):
+    """Event queue that keeps only the newest of back-to-back progress events.
+
+    A progress event for the same request and with the same message as the
+    event at the tail replaces that tail instead of being appended, so a burst
+    the consumer has not caught up with collapses into its latest value. A
+    changed message is always queued, so no distinct status line is lost.
+    """
+
+    def put_nowait(self, item: CodexEvent) -> None:
+        if item.event_type is CodexEventType.PROGRESS and item.related_request_id is not None:
+            tail = self._queue.tail()
+            if (
+                tail is not None
+                and tail.event_type is CodexEventType.PROGRESS
+                and tail.related_request_id == item.related_request_id
+                and _progress_message(tail) == _progress_message(item)
+            ):
+                # Same queue length, and any waiting getter was woken when the
+                # tail was added, so nothing else needs updating.
+                self._queue.replace_tail(item)
+                return
+        super().put_nowait(item)
+
+
+class CodexMCP:
+    """Async client for a single ``codex mcp-server`` subprocess.
+
+    With ``coalesce_progress`` set, consecutive queued progress events for the
+    same request are collapsed into the most recent one. Clients that read
+    only the global queue can pass ``session_queues=False`` so per-session
+    queues nobody drains are not filled.
+
+    ``start()`` binds the client to the running event loop; use it from that
+    loop only.
+    """
+
+    def __init__(self, *, coalesce_progress: bool = False, session_queues: bool = True) -> None:
         self._proc: asyncio.subprocess.Process | None = None
+        # Process group of the server (POSIX only). It is signalled only while
+        # the server is still running; see _terminate_process_group.
+        self._pgid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._next_id: int = 1
         self._reader_task: asyncio.Task[None] | None = None
         self._stderr_task: asyncio.Task[None] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
 
-        # Map request id -> PendingCall
-        self._pending: dict[int, PendingCall] = {}
-        # session_id -> asyncio.Queue[CodexEvent]
-        self._session_queues: dict[str, asyncio.Queue[CodexEvent]] = {}
+        # Map str(request_id) -> PendingCall, matching the event tracker's keys
+        self._pending: dict[str, PendingCall] = {}
+        self._queue_type: type[_EventQueue] = (
+            _ProgressCoalescingQueue if coalesce_progress else _EventQueue
+        )
+        # session_id -> queue, created on the session's first event (or by
+        # get_session_queue()) so late subscribers still see earlier events.
+        self._session_queues: dict[str, _EventQueue] = {}
+        self._publish_session_events = session_queues
         # FIFO of codex calls that are waiting for their first session_configured
-        self._sessionless_queue: deque[PendingCall] = deque()
+        # Keyed by str(request_id); dict order doubles as the FIFO fallback.
+        self._sessionless: dict[str, PendingCall] = {}
         # Global event stream for all notifications, regardless of session.
-        self._global_events: asyncio.Queue[CodexEvent] = asyncio.Queue()
+        # Created by the first get_global_event_queue() call; until then
+        # nothing is published to it. The reader publishes with put_nowait()
+        # and never suspends mid-chunk, so a stalled consumer is bounded by
+        # dropping events, not by waiting.
+        self._global_events: _EventQueue | None = None
+        self._dropped_events = 0
         # Tracker for correlating intermediate notifications.
         self._event_tracker = CodexEventTracker()
 
-        # Protect writes to stdin
-        self._write_lock = asyncio.Lock()
+        # Outgoing frames for the writer task, plus the future resolved once the
+        # batch currently being collected has been drained.
+        self._outbox: list[bytes] = []
+        self._outbox_flushed: asyncio.Future[None] | None = None
+        self._outbox_ready = asyncio.Event()
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -228,8 +445,9 @@ class CodexMCP:
         if self._proc is not None:
             return
 
-        await ensure_codex_logged_in()
+        self._loop = asyncio.get_running_loop()
         codex_path = ensure_codex_present()
+        await ensure_codex_logged_in(codex_path)
 
         # Enable the rmcp_client feature so that Codex emits rich MCP
         # notifications (progress, logging, etc.) over stdout. This mirrors
@@ -251,11 +469,23 @@ class CodexMCP:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             env=env,
+            # Give the server its own process group so stop() can take down any
+            # commands it spawned instead of leaving them orphaned.
+            start_new_session=os.name == "posix",
         )
 
+        if os.name == "posix":
+            self._pgid = self._proc.pid
+
         if self._proc.stdout is None or self._proc.stdin is None:
             raise RuntimeError("Failed to start codex mcp-server with stdio pipes.")
 
+        # Let the server write large responses and notification bursts, and us
+        # write long prompts, without stalling on the default 64 KiB pipe buffer.
+        pipe_size = _pipe_buffer_size()
+        _grow_pipe_buffer(self._proc, 0, pipe_size)
+        _grow_pipe_buffer(self._proc, 1, pipe_size)
+
         # Start reader task that demultiplexes all responses and notifications.
         self._reader_task = asyncio.create_task(self._reader_loop(), name="codex-mcp-reader")
         # Drain stderr so that Codex debug logs do not block the subprocess.
@@ -273,12 +503,13 @@ class CodexMCP:
             return
 
         LOG.info("Stopping codex mcp-server")
+        pgid, self._pgid = self._pgid, None
         if proc.stdin is not None:
             proc.stdin.close()
         try:
             await asyncio.wait_for(proc.wait(), timeout=5.0)
         except TimeoutError:
-            proc.kill()
+            await _terminate_process_group(proc, pgid)
 
         self._proc = None
 
@@ -298,6 +529,23 @@ class CodexMCP:
                 pass
             self._stderr_task = None
 
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+        # Fail senders whose batch never reached the writer instead of leaving
+        # them waiting forever, and start the next run with an empty outbox.
+        flushed = self._outbox_flushed
+        if flushed is not None and not flushed.done():
+            flushed.set_exception(ConnectionResetError("codex mcp-server stopped"))
+        self._outbox = []
+        self._outbox_flushed = None
+        self._outbox_ready.clear()
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -373,18 +621,42 @@ class CodexMCP:
             session_hint=session_id,
         )
 
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a JSON-RPC notification, which has no id and gets no response.
+
+        Unlike tool calls, no future, pending entry, or timeline is created.
+        """
+
+        if self._proc is None or self._proc.stdin is None:
+            raise RuntimeError("Codex MCP server is not running. Call start() first.")
+
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        if LOG.isEnabledFor(logging.DEBUG):
+            LOG.debug("Sending notification method=%s", method)
+        await self._write_frame(_dumps(message) + b"\n")
+
     def get_session_queue(self, session_id: str) -> asyncio.Queue[CodexEvent]:
-        """Return a queue that receives events for ``session_id``."""
+        """Return a queue that receives events for ``session_id``.
+
+        Events that arrived before the first call are already queued.
+        """
 
         queue = self._session_queues.get(session_id)
         if queue is None:
-            queue = asyncio.Queue()
-            self._session_queues[session_id] = queue
+            queue = self._session_queues[session_id] = self._queue_type()
         return queue
 
     def get_global_event_queue(self) -> asyncio.Queue[CodexEvent]:
-        """Return a queue that receives all notification events."""
+        """Return a queue that receives all notification events.
+
+        Events are published only after the first call, so subscribe before
+        sending requests; headless clients that never call this pay nothing.
+        """
 
+        if self._global_events is None:
+            self._global_events = self._queue_type()
         return self._global_events
 
     @property
@@ -409,6 +681,13 @@ class CodexMCP:
 
         stream = self._proc.stderr
         while True:
+            if not LOG.isEnabledFor(logging.DEBUG):
+                # Nobody is listening: drain in bulk without decoding. The level
+                # is re-checked per chunk so enabling debug logging takes effect.
+                if not await stream.read(_READ_CHUNK_SIZE):
+                    return
+                continue
+
             line = await stream.readline()
             if not line:
                 return
@@ -433,60 +712,132 @@ class CodexMCP:
 
         request_id = self._next_id
         self._next_id += 1
+        rid = str(request_id)
+
+        params: dict[str, Any] = {"name": name, "arguments": arguments}
 
-        request: dict[str, Any] = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": "tools/call",
-            "params": {
-                "name": name,
-                "arguments": arguments,
-            },
-        }
-
-        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        loop = self._loop or asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
         pending = PendingCall(
             request_id=request_id,
             method_name=name,
             session_hint=session_hint,
             future=future,
         )
-        self._pending[request_id] = pending
+        self._pending[rid] = pending
         if name == "codex":
             # We expect a session_configured notification once the session is ready.
-            self._sessionless_queue.append(pending)
+            self._sessionless[rid] = pending
 
-        timestamp = asyncio.get_running_loop().time()
+        timestamp = loop.time()
         self._event_tracker.track_outgoing_request(
-            str(request_id),
+            rid,
             method=name,
-            params=request["params"],
+            params=params,
             session_hint=session_hint,
             timestamp=timestamp,
         )
 
-        body = json.dumps(request, separators=(",", ":"))
+        encoded_name = _TOOL_NAME_JSON.get(name) or _dumps(name)
+        frame = _TOOL_CALL_FRAME % (request_id, encoded_name, _dumps(arguments))
 
         async def send() -> None:
             # Re-check proc state in case it died since preparation
             if self._proc is None or self._proc.stdin is None:
                 raise RuntimeError("Codex MCP server is not running.")
 
-            async with self._write_lock:
+            if LOG.isEnabledFor(logging.DEBUG):
                 LOG.debug("Sending request id=%s method=%s", request_id, name)
-                self._proc.stdin.write((body + "\n").encode("utf-8"))
-                await self._proc.stdin.drain()
+            await self._write_frame(frame)
+
+        return rid, future, send
+
+    async def _write_frame(self, frame: bytes) -> None:
+        """Queue ``frame`` for stdin and wait until the writer has drained it."""
 
-        return str(request_id), future, send
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop(), name="codex-mcp-writer")
+
+        self._outbox.append(frame)
+        flushed = self._outbox_flushed
+        if flushed is None:
+            flushed = (self._loop or asyncio.get_running_loop()).create_future()
+            self._outbox_flushed = flushed
+            self._outbox_ready.set()
+        # The batch future is shared; shield it so one cancelled sender does not
+        # cancel the wait for every other frame in the same batch.
+        await asyncio.shield(flushed)
+
+    async def _writer_loop(self) -> None:
+        """Write queued frames to stdin, one ``write``/``drain`` per batch.
+
+        This task is the only writer, so senders never contend on a lock: they
+        append to a plain list and share one future per batch. Every frame
+        queued before the writer wakes up goes out in the same write, so a
+        burst of concurrent sends costs one pipe write and one drain.
+
+        The writer is started by the first send, after the process is known to
+        be running, and is cancelled by :meth:`stop`; stdin is therefore bound
+        once here rather than re-checked for every batch.
+        """
+
+        assert self._proc is not None
+        assert self._proc.stdin is not None
+
+        stdin = self._proc.stdin
+        # writelines() hands the frames to the transport as-is, letting
+        # transports with vectored writes skip joining them into one copy.
+        writelines = stdin.writelines
+        drain = stdin.drain
+        ready = self._outbox_ready
+        while True:
+            await ready.wait()
+            ready.clear()
+            frames, self._outbox = self._outbox, []
+            flushed, self._outbox_flushed = self._outbox_flushed, None
+            if flushed is None:
+                continue
+
+            try:
+                writelines(frames)
+                await drain()
+            except asyncio.CancelledError:
+                # Only stop() cancels the writer; report it to the senders as a
+                # closed connection rather than as their own cancellation.
+                flushed.set_exception(ConnectionResetError("codex mcp-server stopped"))
+                raise
+            except Exception as exc:
+                flushed.set_exception(exc)
+            else:
+                flushed.set_result(None)
 
     async def _reader_loop(self) -> None:
+        """Read stdout in bulk and dispatch each newline-delimited frame.
+
+        Reading large chunks and splitting with ``bytearray.find`` replaces one
+        ``readline()`` await per message, and it is not bound by the
+        ``StreamReader`` line-length limit that large tool outputs can exceed.
+
+        All frames in a chunk are dispatched synchronously, back to back: event
+        publication uses ``put_nowait`` and never waits on a full queue.
+        ``read()`` returns without suspending while the server keeps the pipe
+        full, so the loop yields once per chunk to keep a notification burst
+        from starving the UI.
+        """
+
         assert self._proc is not None
         assert self._proc.stdout is not None
 
-        stdout = self._proc.stdout
+        read = self._proc.stdout.read
+        dispatch = self._dispatch_frame
+        clock = asyncio.get_running_loop().time
+        buffer = bytearray()
         while True:
-            line = await stdout.readline()
-            if not line:
+            chunk = await read(_READ_CHUNK_SIZE)
+            if not chunk:
+                if buffer:
+                    # Flush a final frame that was not newline-terminated.
+                    dispatch(buffer, clock())
                 LOG.info("codex mcp-server closed stdout")
                 # Fail all pending futures.
                 exc = RuntimeError("codex mcp-server terminated unexpectedly")
@@ -494,43 +845,87 @@ class CodexMCP:
                     if not pending.future.done():
                         pending.future.set_exception(exc)
                 self._pending.clear()
+                self._sessionless.clear()
                 return
 
-            text = line.decode("utf-8").strip()
-            if not text:
-                continue
+            # Only a partial frame left over from the previous read needs joining;
+            # otherwise frames are sliced straight out of the chunk.
+            data: bytes | bytearray
+            if buffer:
+                buffer += chunk
+                data = buffer
+            else:
+                data = chunk
+            # Frames from the same read arrived together; one clock read
+            # timestamps all of them.
+            now = clock()
+            start = 0
+            while (newline := data.find(b"\n", start)) != -1:
+                # Slicing copies the frame once; both JSON backends decode a
+                # bytearray directly, so no further bytes() copy is needed.
+                frame = data[start:newline]
+                start = newline + 1
+                dispatch(frame, now)
+            if data is buffer:
+                del buffer[:start]
+            elif start < len(chunk):
+                buffer += memoryview(chunk)[start:]
+            await asyncio.sleep(0)
+
+    def _dispatch_frame(self, frame: bytes | bytearray, timestamp: float) -> None:
+        if frame[:1] != b"{":
+            # Every JSON-RPC message is an object, so anything else (blank lines,
+            # stray log output) is rejected here without raising a decode error.
+            frame = frame.strip()
+            if not frame:
+                return
+            if frame[:1] != b"{":
+                # Only pay for the decode when the record will be emitted.
+                if LOG.isEnabledFor(logging.WARNING):
+                    LOG.warning(
+                        "Ignoring non-JSON output from codex mcp-server: %s",
+                        frame.decode("utf-8", errors="replace"),
+                    )
+                return
 
-            try:
-                message = json.loads(text)
-            except json.JSONDecodeError:
-                LOG.warning("Failed to decode JSON from codex mcp-server: %s", text)
-                continue
+        try:
+            # Both decoders accept bytes and ignore trailing whitespace, so the
+            # frame never needs an intermediate decode()/strip() copy.
+            message = _loads(frame)
+        except ValueError:
+            if LOG.isEnabledFor(logging.WARNING):
+                LOG.warning(
+                    "Failed to decode JSON from codex mcp-server: %s",
+                    frame.decode("utf-8", errors="replace").strip(),
+                )
+            return
 
-            await self._handle_message(message)
+        self._handle_message(message, timestamp)
 
-    async def _handle_message(self, message: dict[str, Any]) -> None:
+    def _handle_message(self, message: dict[str, Any], timestamp: float) -> None:
         # Notifications have a "method" field and no "result"/"error" payload.
         # Some servers may still include an "id" for correlation, so we
         # classify based on the absence of result/error rather than id.
         if "method" in message and "result" not in message and "error" not in message:
-            await self._handle_notification(message)
+            self._handle_notification(message, timestamp)
             return
 
         # Responses refer to an earlier request id.
         if "id" in message and ("result" in message or "error" in message):
-            request_id = message["id"]
-            pending = self._pending.pop(request_id, None)
+            rid = str(message["id"])
+            pending = self._pending.pop(rid, None)
             if pending is None:
-                LOG.warning("Received response for unknown id=%s", request_id)
+                LOG.warning("Received response for unknown id=%s", rid)
                 return
 
-            rid = str(request_id)
+            # A call that finished without ever reporting session_configured must
+            # not linger as a FIFO fallback candidate for later sessions.
+            self._sessionless.pop(rid, None)
             timeline = self._event_tracker.get_request_timeline(rid)
             session_id = pending.session_hint
             if timeline is not None and timeline.session_id is not None:
                 session_id = timeline.session_id
 
-            timestamp = asyncio.get_running_loop().time()
             self._event_tracker.track_response(
                 rid,
                 message=message,
@@ -538,16 +933,12 @@ class CodexMCP:
                 session_id=session_id,
             )
 
-            event = CodexEvent(
-                raw=message,
-                session_id=session_id,
-                is_notification=False,
-                event_type=CodexEventType.RESPONSE,
-                related_request_id=rid,
-                request_id=rid,
-                timestamp=timestamp,
-            )
-            await self._global_events.put(event)
+            if self._global_events is not None:
+                self._global_events.put_nowait(
+                    CodexEvent(
+                        message, session_id, False, CodexEventType.RESPONSE, rid, rid, timestamp
+                    )
+                )
 
             if not pending.future.done():
                 if "error" in message:
@@ -559,75 +950,72 @@ class CodexMCP:
         # Errors or other messages.
         LOG.warning("Unhandled message from codex mcp-server: %s", message)
 
-    async def _handle_notification(self, message: dict[str, Any]) -> None:
+    def _handle_notification(self, message: dict[str, Any], timestamp: float) -> None:
         method = message.get("method")
-        params = message.get("params") or {}
-        payload = _flatten_notification_payload(params)
-        related_request_id = _extract_related_request_id(message)
-
-        # Extract session id if present in known notification shapes.
-        session_id: str | None = payload.get("session_id")
-        if method == "session_configured" and session_id is not None and self._sessionless_queue:
+        related_request_id, session_id = _parse_notification(message)
+        if method == "session_configured" and session_id is not None and self._sessionless:
             # Try to match a pending session call by ID, falling back to FIFO if not possible.
-            matched_pending: PendingCall | None = None
-
-            if related_request_id is not None:
-                for pending in self._sessionless_queue:
-                    if str(pending.request_id) == related_request_id:
-                        matched_pending = pending
-                        break
-
-            if matched_pending is None:
+            if related_request_id in self._sessionless:
+                matched_rid = related_request_id
+            else:
                 # Fallback: assume strict ordering if no ID is available to correlate.
-                matched_pending = self._sessionless_queue[0]
-
-            if matched_pending:
-                # Remove from the deque (safe since we have the object reference)
-                try:
-                    self._sessionless_queue.remove(matched_pending)
-                except ValueError:
-                    pass
-
-                LOG.info(
-                    "Associated session_id=%s with request id=%s",
-                    session_id,
-                    matched_pending.request_id,
-                )
-                matched_pending.session_hint = session_id
-                self._event_tracker.set_session_id(str(matched_pending.request_id), session_id)
+                matched_rid = next(iter(self._sessionless))
+            matched_pending = self._sessionless.pop(matched_rid)
+
+            LOG.info("Associated session_id=%s with request id=%s", session_id, matched_rid)
+            matched_pending.session_hint = session_id
+            self._event_tracker.set_session_id(matched_rid, session_id)
 
         event_type = _classify_event_type(method)
-        timestamp = asyncio.get_running_loop().time()
 
         event = CodexEvent(
-            raw=message,
-            session_id=session_id,
-            is_notification=True,
-            event_type=event_type,
-            related_request_id=related_request_id,
-            timestamp=timestamp,
+            message, session_id, True, event_type, related_request_id, None, timestamp
         )
 
         # Publish to the global event stream first so consumers can observe all activity.
-        await self._global_events.put(event)
+        if self._global_events is not None:
+            self._publish(self._global_events, event, _GLOBAL_PROGRESS_BACKLOG)
 
         if related_request_id is not None:
-            tracked = TrackedNotification(
-                event_type=event_type,
-                message=message,
-                timestamp=timestamp,
-                session_id=session_id,
-                related_request_id=related_request_id,
-            )
-            self._event_tracker.track_notification(related_request_id, tracked)
+            timeline = self._event_tracker.get_request_timeline(related_request_id)
+            if timeline is None or timeline.tracked:
+                tracked = TrackedNotification(
+                    event_type, message, timestamp, session_id, related_request_id
+                )
+                self._event_tracker.track_notification(related_request_id, tracked)
+            elif session_id and timeline.session_id is None:
+                # Not recording history, but still learn the session for routing.
+                timeline.session_id = session_id
 
         if session_id:
-            queue = self.get_session_queue(session_id)
-            await queue.put(event)
-        else:
+            if self._publish_session_events:
+                queue = self._session_queues.get(session_id)
+                if queue is None:
+                    queue = self._session_queues[session_id] = self._queue_type()
+                self._publish(queue, event, _SESSION_PROGRESS_BACKLOG)
+        elif LOG.isEnabledFor(logging.DEBUG):
             # No obvious session; keep the event only in the global stream.
             LOG.debug("Notification without session id: %s", message)
 
+    def _publish(self, queue: _EventQueue, event: CodexEvent, backlog: int) -> None:
+        if (
+            event.event_type is CodexEventType.PROGRESS
+            and queue.qsize() >= backlog
+            and queue.evict_oldest_progress()
+        ):
+            # Progress is the only stream chatty enough to pile up, and a stale
+            # percentage is safe to lose; everything else is always delivered.
+            self._count_dropped_event()
+        queue.put_nowait(event)
+
+    def _count_dropped_event(self) -> None:
+        self._dropped_events += 1
+        if self._dropped_events % 1000 == 1:
+            LOG.warning(
+                "Dropped %d MCP events because their consumer is falling behind",
+                self._dropped_events,
+            )
+
 
 def configure_logging(level: int = logging.INFO) -> None:
     """Configure basic logging to stderr for the MCP client."""
@@ -646,10 +1034,109 @@ def configure_logging(level: int = logging.INFO) -> None:
 # ----------------------------------------------------------------------
 # Helpers
 # ----------------------------------------------------------------------
+def _pipe_buffer_size() -> int:
+    """Return ``_PIPE_BUFFER_SIZE`` clamped to the kernel's unprivileged limit."""
+
+    try:
+        with open("/proc/sys/fs/pipe-max-size", "rb") as handle:
+            limit = int(handle.read())
+    except (OSError, ValueError):
+        return _PIPE_BUFFER_SIZE
+    return min(_PIPE_BUFFER_SIZE, limit)
+
+
+def _grow_pipe_buffer(proc: asyncio.subprocess.Process, fd: int, size: int) -> None:
+    """Best-effort enlarge the kernel buffer of one of ``proc``'s stdio pipes."""
+
+    if sys.platform != "linux":
+        return
+
+    import fcntl
+
+    # asyncio.subprocess.Process has no public accessor for its subprocess
+    # transport, so this reads the private ``_transport`` attribute. It is
+    # looked up defensively: if a Python version or loop (uvloop) lacks it, or
+    # does not report the pipe file object, the default buffer size is kept.
+    transport = getattr(proc, "_transport", None)
+    pipe_transport = transport.get_pipe_transport(fd) if transport is not None else None
+    pipe = pipe_transport.get_extra_info("pipe") if pipe_transport is not None else None
+    if pipe is None:
+        return
+
+    try:
+        fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, size)
+    except OSError as exc:
+        LOG.debug("Could not resize codex mcp-server pipe %s: %s", fd, exc)
+
+
+async def _terminate_process_group(proc: asyncio.subprocess.Process, pgid: int | None) -> None:
+    """Stop ``proc`` and its process group: SIGTERM, a grace period, then SIGKILL.
+
+    On POSIX the server is started as a session leader, so signalling ``pgid``
+    reaches every command it spawned. Once the leader has been reaped its pgid
+    may be reused by an unrelated group, so the group is only signalled while
+    ``proc.returncode`` is None. asyncio sets returncode right after reaping, so
+    this narrows that window rather than closing it. Commands that outlive the
+    server are not signalled. Without a pgid (other platforms) only the server
+    itself is stopped.
+    """
+
+    _signal_server(proc, pgid, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=_TERMINATE_GRACE_PERIOD)
+    except TimeoutError:
+        _signal_server(proc, pgid, signal.SIGKILL)
+    await proc.wait()
+
+
+def _signal_server(proc: asyncio.subprocess.Process, pgid: int | None, sig: int) -> None:
+    """Send ``sig`` to the server's process group, or the server alone without one."""
+
+    if proc.returncode is not None:
+        return
+    try:
+        if pgid is None:
+            proc.send_signal(sig)
+        else:
+            os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _dumps(payload: Any) -> bytes:
+    """Serialize a JSON value to compact UTF-8 bytes."""
+
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes | bytearray) -> Any:
+    """Decode a JSON-RPC frame; raises ``ValueError`` on malformed input."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Methods seen on nearly every notification, resolved with one dict lookup.
+# Values must agree with the substring rules in _classify_event_type.
+_EVENT_TYPE_BY_METHOD: dict[str, CodexEventType] = {
+    "codex/event": CodexEventType.NOTIFICATION,
+    "session_configured": CodexEventType.NOTIFICATION,
+    "notifications/progress": CodexEventType.PROGRESS,
+    "notifications/logging/message": CodexEventType.LOGGING,
+}
+
+
 def _classify_event_type(method: str | None) -> CodexEventType:
     if not method:
         return CodexEventType.NOTIFICATION
 
+    known = _EVENT_TYPE_BY_METHOD.get(method)
+    if known is not None:
+        return known
+
     lowered = method.lower()
     if "progress" in lowered:
         return CodexEventType.PROGRESS
@@ -660,36 +1147,50 @@ def _classify_event_type(method: str | None) -> CodexEventType:
     return CodexEventType.NOTIFICATION
 
 
-def _flatten_notification_payload(params: dict[str, Any]) -> dict[str, Any]:
-    payload = params or {}
-    msg = payload.get("msg")
-    if isinstance(msg, dict):
-        return msg
-    return payload
-
+def _progress_message(event: CodexEvent) -> Any:
+    """Return the status text a progress notification displays, if any."""
 
-def _extract_related_request_id(message: dict[str, Any]) -> str | None:
-    params = message.get("params") or {}
+    params = event.raw.get("params")
+    if not isinstance(params, dict):
+        return None
+    msg = params.get("msg")
+    payload = msg if isinstance(msg, dict) else params
+    return payload.get("message") or payload.get("data")
 
-    # Check _meta for requestId (seen in new events.log format)
-    meta = params.get("_meta")
-    if isinstance(meta, dict):
-        req_id = meta.get("requestId")
-        if req_id is not None:
-            return str(req_id)
 
-    keys = ("related_request_id", "request_id")
+def _parse_notification(message: dict[str, Any]) -> tuple[str | None, str | None]:
+    """Return ``(related_request_id, session_id)`` for a notification.
 
-    for key in keys:
-        value = params.get(key)
-        if value is not None:
-            return str(value)
+    Walks ``params`` and its nested Codex ``msg`` object once. The request id
+    is taken from ``params._meta.requestId`` (new events.log format), then
+    ``related_request_id``/``request_id`` on ``params``, then on ``msg``. The
+    session id is read from ``msg`` when present, otherwise from ``params``.
+    """
 
+    params = message.get("params")
+    if not isinstance(params, dict):
+        return None, None
     msg = params.get("msg")
-    if isinstance(msg, dict):
-        for key in keys:
-            value = msg.get(key)
-            if value is not None:
-                return str(value)
+    if not isinstance(msg, dict):
+        msg = None
+
+    session_id = (msg if msg is not None else params).get("session_id")
 
-    return None
+    # Fast path: every current codex/event carries _meta.requestId, so the
+    # legacy fallbacks below are only walked for older or foreign servers.
+    related: Any = None
+    meta = params.get("_meta")
+    if isinstance(meta, dict):
+        related = meta.get("requestId")
+        if related is not None:
+            return str(related), session_id
+
+    related = params.get("related_request_id")
+    if related is None:
+        related = params.get("request_id")
+    if related is None and msg is not None:
+        related = msg.get("related_request_id")
+        if related is None:
+            related = msg.get("request_id")
+
+    return (str(related) if related is not None else None), session_id
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import asyncio
+import binascii
+import functools
 import io
 import logging
 import sys
 from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, TextIO
@@ -21,11 +24,44 @@ from textual.widgets import Footer, Input, Log
 
 from ..mcp_client import CodexEvent, CodexEventType, CodexMCP, configure_logging
 from ..worktrees import SessionWorktree, ensure_session_worktree
-from .session_manager import SessionManager
-from .widgets import SessionPane, SessionRow
+from .session_manager import SessionManager, SessionModel
+from .widgets import PromptInput, SessionPane, SessionRow
 
 LOG = logging.getLogger(__name__)
 
+# Most MCP events the router handles per wakeup before yielding to the UI.
+_ROUTER_BATCH_SIZE = 64
+
+# Panes beyond this many stay mounted (so they keep receiving output) but hidden.
+_MAX_VISIBLE_PANES = 3
+
+# With the dev log panel on, a watchdog wakes this often and warns when the loop
+# was held up for longer than the budget by synchronous work.
+_LOOP_WATCHDOG_INTERVAL = 0.25
+_LOOP_STALL_BUDGET = 0.05
+
+# Dev-log lines from any thread are buffered and written to the panel in one
+# batch per tick, instead of one widget update per line.
+_DEV_LOG_FLUSH_INTERVAL = 0.05
+
+
+@functools.lru_cache(maxsize=256)
+def _escaped_progress_message(message: str) -> str:
+    # Progress messages repeat ("Working...") across a burst; escape them once.
+    return escape(message)
+
+
+@functools.lru_cache(maxsize=32)
+def _level_prefix(level: str) -> str:
+    return f"[cyan]{escape(level)}[/] "
+
+
+def _result_content(result: dict[str, Any]) -> Any:
+    # Only fall back to the whole payload when there is no content at all;
+    # an empty reply should not render the tool result's repr.
+    content = result.get("content")
+    return result if content is None else content
+
 
 @dataclass(slots=True)
 class AppConfig:
@@ -74,10 +110,15 @@ class _TextualStreamTap(io.TextIOBase):
             self._stream.write(data)
 
         text = data.replace("\r\n", "\n").replace("\r", "\n")
-        self._buffer += text
-
-        while "\n" in self._buffer:
-            line, self._buffer = self._buffer.split("\n", 1)
+        if "\n" not in text:
+            self._buffer += text
+            return len(data)
+
+        # One split per write; re-splitting the remainder per line was
+        # quadratic in the size of large writes.
+        lines = (self._buffer + text).split("\n")
+        self._buffer = lines.pop()
+        for line in lines:
             self._emit(line)
         return len(data)
 
@@ -200,9 +241,40 @@ class ParallelCodexApp(App[None]):
         super().__init__()
         self._config = config
         self._sessions = SessionManager()
-        self._mcp = CodexMCP()
+        # A burst of progress the router has not drained yet only needs its
+        # latest value per message; a changed message still renders. Everything
+        # is routed from the global queue, so per-session queues are not filled.
+        self._mcp = CodexMCP(coalesce_progress=True, session_queues=False)
         self._session_counter = 0
-        self._event_tasks: list[asyncio.Task[None]] = []
+        self._session_create_lock = asyncio.Lock()
+        # Background tasks still running; each removes itself when done.
+        self._event_tasks: set[asyncio.Task[None]] = set()
+        # Set in compose(); kept so session changes skip a DOM query.
+        self._row: SessionRow | None = None
+        # Session name -> mounted pane, so event routing avoids walking the row.
+        self._panes: dict[str, SessionPane] = {}
+        # Names of overflow panes hidden beyond _MAX_VISIBLE_PANES, oldest first.
+        self._hidden_panes: list[str] = []
+        # Session name -> prompts waiting for that session's worker, and the worker
+        # itself; see _enqueue_prompt.
+        self._session_inboxes: dict[str, asyncio.Queue[tuple[SessionPane, str]]] = {}
+        self._session_workers: dict[str, asyncio.Task[None]] = {}
+        # Renderers for classified MCP events; see _route_event.
+        self._event_handlers: dict[CodexEventType, Callable[[CodexEvent], None]] = {
+            CodexEventType.PROGRESS: self._handle_progress_notification,
+            CodexEventType.LOGGING: self._handle_logging_notification,
+        }
+        # Renderers for codex/event payloads, keyed by msg type; other types are
+        # ignored. See _handle_generic_notification.
+        self._codex_msg_handlers: dict[str, Callable[[SessionPane, dict], None]] = {
+            "item_completed": self._on_item_completed,
+            "reasoning_content_delta": self._on_reasoning_delta,
+            "exec_command_begin": self._on_exec_begin,
+            "exec_command_output_delta": self._on_exec_output,
+            "exec_command_end": self._on_exec_end,
+            "agent_message_delta": self._on_agent_delta,
+            "agent_message_content_delta": self._on_agent_delta,
+        }
         self._request_to_model: dict[str, Any] = {}
         self._log_handler: _TextualLogHandler | None = None
         self._stdout_tap: _TextualStreamTap | None = None
@@ -220,13 +292,27 @@ class ParallelCodexApp(App[None]):
         # Optionally mirror Python logs into the in-app dev log panel.
         if self._config.show_log_panel:
             self._enable_dev_console()
+            self._track_task(
+                asyncio.create_task(self._loop_watchdog(), name="event-loop-watchdog")
+            )
         await self._mcp.start()
         # Start a task to route MCP notifications into the UI.
         events_task = asyncio.create_task(self._event_router(), name="codex-event-router")
-        self._event_tasks.append(events_task)
+        self._track_task(events_task)
         # Start with a single session by default.
         await self._ensure_session()
 
+    async def _loop_watchdog(self) -> None:
+        """Log whenever something blocked the event loop past the stall budget."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + _LOOP_WATCHDOG_INTERVAL
+            await asyncio.sleep(_LOOP_WATCHDOG_INTERVAL)
+            stall = loop.time() - expected
+            if stall > _LOOP_STALL_BUDGET:
+                LOG.warning("Event loop blocked for %.0f ms", stall * 1000)
+
     async def on_ready(self) -> None:
         if not self._config.show_log_panel:
             return
@@ -236,18 +322,26 @@ class ParallelCodexApp(App[None]):
             self._dev_log_widget = None
         else:
             self._flush_dev_log_buffer()
+            self.set_interval(_DEV_LOG_FLUSH_INTERVAL, self._flush_dev_log_buffer)
 
     async def on_shutdown(self) -> None:
-        for task in self._event_tasks:
+        tasks = list(self._event_tasks)
+        for task in tasks:
             task.cancel()
-        await self._mcp.stop()
+        # Let the cancelled tasks unwind while the server shuts down, so none
+        # of them is still pending when the loop closes.
+        results = await asyncio.gather(*tasks, self._mcp.stop(), return_exceptions=True)
+        stop_result = results[-1]
+        if isinstance(stop_result, Exception):
+            LOG.warning("Error while stopping codex mcp-server", exc_info=stop_result)
 
         if self._config.show_log_panel:
             self._disable_dev_console()
 
     def compose(self) -> ComposeResult:
         with Vertical():
-            yield SessionRow()
+            self._row = SessionRow()
+            yield self._row
             if self._config.show_log_panel:
                 log_widget = Log(id="dev-log")
                 log_widget.border_title = "Logs"
@@ -274,7 +368,7 @@ class ParallelCodexApp(App[None]):
         logging.getLogger().setLevel(logging.DEBUG)
         self._attach_log_handler()
         self._redirect_standard_streams()
-        self._write_dev_log_line("[dev] Log console capturing logging + stdout/stderr")
+        self._submit_dev_log_line("[dev] Log console capturing logging + stdout/stderr")
 
     def _disable_dev_console(self) -> None:
         self._restore_standard_streams()
@@ -313,32 +407,20 @@ class ParallelCodexApp(App[None]):
         self._stderr_tap = None
 
     def _submit_dev_log_line(self, line: str) -> None:
-        if not self._config.show_log_panel:
-            return
-
-        def _deliver() -> None:
-            self._write_dev_log_line(line)
-
-        try:
-            self.call_from_thread(_deliver)
-        except RuntimeError:
-            self._dev_log_buffer.append(line)
-
-    def _write_dev_log_line(self, line: str) -> None:
-        if not line:
-            return
-        widget = self._dev_log_widget
-        if widget is None:
+        # Only reachable through the handler and taps _enable_dev_console
+        # installs, so there is no need to re-check show_log_panel per line.
+        # Safe from any thread: deque.append is atomic, and the interval set up
+        # in on_ready drains the buffer on the UI thread.
+        if line:
             self._dev_log_buffer.append(line)
-            return
-        widget.write_line(line)
 
     def _flush_dev_log_buffer(self) -> None:
         widget = self._dev_log_widget
-        if widget is None:
+        if widget is None or not self._dev_log_buffer:
             return
-        while self._dev_log_buffer:
-            widget.write_line(self._dev_log_buffer.popleft())
+        buffer = self._dev_log_buffer
+        batch = [buffer.popleft() for _ in range(len(buffer))]
+        widget.write_lines(batch)
 
     # ------------------------------------------------------------------
     # Session management helpers
@@ -346,39 +428,70 @@ class ParallelCodexApp(App[None]):
     async def _ensure_session(self) -> SessionPane:
         """Create a new logical session and associated UI pane."""
 
-        self._session_counter += 1
-        session_name = f"session-{self._session_counter}"
-        model = self._sessions.create_session(session_name)
-
-        # Ensure git worktree for this session.
-        worktree: SessionWorktree = ensure_session_worktree(
-            repo_root=self._config.repo_root,
-            agents_base=self._config.agents_base,
-            session_name=session_name,
-        )
-        model.branch_name = worktree.branch_name
-        model.workspace_path = worktree.path
-        LOG.info(
-            "Session %s ready (branch=%s, workspace=%s)",
-            session_name,
-            worktree.branch_name,
-            worktree.path,
-        )
-
-        row = self.query_one(SessionRow)
-        pane = SessionPane(session_name)
-        row.mount(pane)
-
-        # Ensure we don't exceed three panes; overflow sessions can be added as tabs later.
-        children = list(row.children)
-        if len(children) > 3:
-            # For now, simply hide additional panes from view.
-            for extra in children[3:]:
-                extra.display = False
+        # Serialized so rapid Ctrl+N presses never interleave counter bumps,
+        # worktree setup and mounts once any of those steps awaits.
+        async with self._session_create_lock:
+            self._session_counter += 1
+            session_name = f"session-{self._session_counter}"
+            model = self._sessions.create_session(session_name)
+
+            row = self._row
+            assert row is not None
+            pane = SessionPane(session_name)
+            # Ensure we don't exceed three panes; overflow sessions can be added as tabs later.
+            if len(self._panes) - len(self._hidden_panes) >= _MAX_VISIBLE_PANES:
+                # For now, simply hide additional panes from view.
+                pane.display = False
+                self._hidden_panes.append(session_name)
+            await row.mount(pane)
+            self._panes[session_name] = pane
+
+            self._sessions.focus(session_name)
+            self._update_focus_visuals()
 
-        self._sessions.focus(session_name)
-        self._update_focus_visuals()
-        return pane
+            # Ensure git worktree for this session. `git worktree add` can take a
+            # while, so run it off the event loop and keep the pane's prompt
+            # disabled until the session has somewhere to run.
+            pane.set_provisioning(True)
+            try:
+                worktree: SessionWorktree = await asyncio.to_thread(
+                    ensure_session_worktree,
+                    repo_root=self._config.repo_root,
+                    agents_base=self._config.agents_base,
+                    session_name=session_name,
+                )
+            except BaseException:
+                self._discard_session(session_name)
+                self._update_focus_visuals()
+                raise
+            model.branch_name = worktree.branch_name
+            model.workspace_path = worktree.path
+            LOG.info(
+                "Session %s ready (branch=%s, workspace=%s)",
+                session_name,
+                worktree.branch_name,
+                worktree.path,
+            )
+            pane.set_provisioning(False)
+            if self._sessions.focused is model:
+                pane.focus_input()
+            return pane
+
+    def _discard_session(self, name: str) -> None:
+        """Drop a session's worker, pane and model."""
+        worker = self._session_workers.pop(name, None)
+        if worker is not None:
+            worker.cancel()
+        self._session_inboxes.pop(name, None)
+        pane = self._panes.pop(name, None)
+        if pane is not None:
+            if not pane.display:
+                self._hidden_panes.remove(name)
+            elif self._hidden_panes:
+                # Reveal the oldest hidden session in the freed slot.
+                self._panes[self._hidden_panes.pop(0)].display = True
+            pane.remove()
+        self._sessions.close_session(name)
 
     def _get_focused_pane(self) -> SessionPane | None:
         focused = self._sessions.focused
@@ -387,18 +500,24 @@ class ParallelCodexApp(App[None]):
         return self._get_pane_by_name(focused.name)
 
     def _get_pane_by_name(self, name: str) -> SessionPane | None:
-        row = self.query_one(SessionRow)
-        for pane in row.children:
-            if isinstance(pane, SessionPane) and pane.id == name:
-                return pane
-        return None
-
-    def _update_focus_visuals(self) -> None:
-        row = self.query_one(SessionRow)
+        return self._panes.get(name)
+
+    def _update_focus_visuals(self) -> SessionPane | None:
         focused = self._sessions.focused
-        for pane in row.children:
-            if isinstance(pane, SessionPane):
-                pane.is_focused = focused is not None and pane.id == focused.name
+        focused_name = focused.name if focused is not None else None
+        focused_pane = None
+        for name, pane in self._panes.items():
+            is_focused = name == focused_name
+            pane.is_focused = is_focused
+            if is_focused:
+                focused_pane = pane
+        return focused_pane
+
+    def _refocus(self) -> None:
+        """Update focus visuals and move keyboard focus in the same pass."""
+        pane = self._update_focus_visuals()
+        if pane is not None:
+            pane.focus_input()
 
     # ------------------------------------------------------------------
     # Actions / key bindings
@@ -409,34 +528,19 @@ class ParallelCodexApp(App[None]):
 
     def action_cycle_session(self) -> None:
         self._sessions.cycle_focus(forward=True)
-        self._update_focus_visuals()
-        self._focus_current_input()
-
-    def action_focus_session_1(self) -> None:
-        self._sessions.focus_by_index(0)
-        self._update_focus_visuals()
-        self._focus_current_input()
-
-    def action_focus_session_2(self) -> None:
-        self._sessions.focus_by_index(1)
-        self._update_focus_visuals()
-        self._focus_current_input()
+        self._refocus()
 
-    def action_focus_session_3(self) -> None:
-        self._sessions.focus_by_index(2)
-        self._update_focus_visuals()
-        self._focus_current_input()
+    def action_focus_session(self, index: int) -> None:
+        """Focus the session at ``index``; bind keys as ``focus_session(0)``."""
+        self._sessions.focus_by_index(index)
+        self._refocus()
 
     def action_close_session(self) -> None:
         focused = self._sessions.focused
         if focused is None:
             return
-        pane = self._get_focused_pane()
-        if pane is not None:
-            pane.remove()
-        self._sessions.close_session(focused.name)
-        self._update_focus_visuals()
-        self._focus_current_input()
+        self._discard_session(focused.name)
+        self._refocus()
 
     def _focus_current_input(self) -> None:
         pane = self._get_focused_pane()
@@ -456,7 +560,11 @@ class ParallelCodexApp(App[None]):
             return
         event.input.value = ""
 
-        pane = event.input.query_ancestor(SessionPane)
+        if isinstance(event.input, PromptInput):
+            # Set at construction, so no DOM walk on every submit.
+            pane = event.input.pane
+        else:
+            pane = event.input.query_ancestor(SessionPane)
         if pane is None:
             return
 
@@ -466,7 +574,6 @@ class ParallelCodexApp(App[None]):
             self._update_focus_visuals()
 
         pane.add_user_message(prompt)
-        pane.start_processing()
         pane_identifier = pane.id or "<unknown>"
         LOG.info("Prompt submitted in %s: %s", pane_identifier, self._truncate(prompt))
 
@@ -474,19 +581,51 @@ class ParallelCodexApp(App[None]):
         if model is None:
             return
 
-        if model.session_id is None:
-            # Start a new Codex session.
-            config = {
-                "model": self._config.model,
-                "workspace_path": str(model.workspace_path) if model.workspace_path else None,
-                "sandbox": self._config.sandbox,
-            }
-            # Record that this model is waiting on a session_configured event.
-            task = asyncio.create_task(self._run_codex_call(model, pane, prompt, config))
-        else:
-            task = asyncio.create_task(self._run_codex_reply(model, pane, prompt))
+        self._enqueue_prompt(model, pane, prompt)
+
+    def _enqueue_prompt(self, model: SessionModel, pane: SessionPane, prompt: str) -> None:
+        # Each session runs its prompts one at a time, in submission order, so a
+        # quick second prompt neither opens a second Codex session nor interleaves
+        # its output with the first. Different sessions still run concurrently.
+        inbox = self._session_inboxes.get(model.name)
+        if inbox is None:
+            inbox = self._session_inboxes[model.name] = asyncio.Queue()
+            worker = asyncio.create_task(
+                self._session_worker(model, inbox), name=f"codex-{model.name}"
+            )
+            self._session_workers[model.name] = worker
+            self._track_task(worker)
+        inbox.put_nowait((pane, prompt))
 
-        self._event_tasks.append(task)
+    async def _session_worker(
+        self,
+        model: SessionModel,
+        inbox: asyncio.Queue[tuple[SessionPane, str]],
+    ) -> None:
+        while True:
+            pane, prompt = await inbox.get()
+            pane.start_processing()
+            try:
+                if model.session_id is None:
+                    # Start a new Codex session.
+                    config = {
+                        "model": self._config.model,
+                        "workspace_path": (
+                            str(model.workspace_path) if model.workspace_path else None
+                        ),
+                        "sandbox": self._config.sandbox,
+                    }
+                    await self._run_codex_call(model, pane, prompt, config)
+                else:
+                    await self._run_codex_reply(model, pane, prompt)
+            except Exception as exc:
+                LOG.exception("Codex request failed in %s", model.name)
+                # Leave the processing state so the loader does not spin forever.
+                pane.finish_processing(f"Error: {exc}")
+
+    def _track_task(self, task: asyncio.Task[None]) -> None:
+        self._event_tasks.add(task)
+        task.add_done_callback(self._event_tasks.discard)
 
     async def _run_codex_call(
         self,
@@ -505,13 +644,17 @@ class ParallelCodexApp(App[None]):
         try:
             await send()
             result = await future
-            # Pass raw content list; pane.finish_processing will normalize it.
-            content = result.get("content") or result
-            pane.finish_processing(content)
+            # Pass raw content list; the pane will normalize it.
+            await pane.finish_processing_incrementally(_result_content(result))
         finally:
             self._request_to_model.pop(request_id, None)
 
-        # Session id will be bound asynchronously by the event router.
+        # The event router normally binds the session id, but it may not have
+        # drained session_configured yet; the next queued prompt needs it now.
+        if model.session_id is None:
+            timeline = self._mcp.event_tracker.get_request_timeline(request_id)
+            if timeline is not None and timeline.session_id is not None:
+                self._sessions.bind_session_id(model, timeline.session_id)
 
     async def _run_codex_reply(
         self,
@@ -528,8 +671,7 @@ class ParallelCodexApp(App[None]):
         try:
             await send()
             result = await future
-            content = result.get("content") or result
-            pane.finish_processing(content)
+            await pane.finish_processing_incrementally(_result_content(result))
         finally:
             self._request_to_model.pop(request_id, None)
 
@@ -541,45 +683,57 @@ class ParallelCodexApp(App[None]):
 
         queue = self._mcp.get_global_event_queue()
         while True:
+            # Handle what queued up while we were away in one wakeup rather than
+            # suspending once per event during a notification burst.
             event: CodexEvent = await queue.get()
-            method = event.raw.get("method")
+            self._route_event(event)
+            for _ in range(_ROUTER_BATCH_SIZE - 1):
+                if queue.empty():
+                    break
+                self._route_event(queue.get_nowait())
+            else:
+                # A full batch; queue.get() would not suspend while items remain,
+                # so yield explicitly to let Textual paint between batches.
+                await asyncio.sleep(0)
+
+    def _route_event(self, event: CodexEvent) -> None:
+        method = event.raw.get("method")
+        if LOG.isEnabledFor(logging.DEBUG):
             LOG.debug(
-                f"MCP event: type={event.event_type} method={method!r} "
-                f"is_notification={event.is_notification} raw={event.raw}"
+                "MCP event: type=%s method=%r is_notification=%s raw=%s",
+                event.event_type,
+                method,
+                event.is_notification,
+                event.raw,
             )
 
-            if method == "session_configured":
-                session_id = event.session_id
-                request_id = event.related_request_id
-
-                if session_id and request_id:
-                    model = self._request_to_model.get(request_id)
-                    if model:
-                        model.session_id = session_id
-                        LOG.info(
-                            "Session configured: %s -> %s (req=%s)",
-                            model.name,
-                            session_id,
-                            request_id,
-                        )
-                continue
-
-            if event.event_type == CodexEventType.PROGRESS:
-                LOG.debug("MCP progress event: %s", event.raw)
-                self._handle_progress_notification(event)
-                continue
-
-            if event.event_type == CodexEventType.LOGGING:
-                LOG.debug("MCP logging event: %s", event.raw)
-                self._handle_logging_notification(event)
-                continue
+        if method == "session_configured":
+            self._handle_session_configured(event)
+            return
 
+        handler = self._event_handlers.get(event.event_type)
+        if handler is not None:
+            handler(event)
+        elif event.is_notification:
             # Any other notification types are surfaced as generic events so that
             # intermediate activity is still visible in the UI and logs.
-            if event.is_notification:
-                # LOG.debug("MCP notification event (unhandled): %s", event.raw)
-                self._handle_generic_notification(event)
-                continue
+            self._handle_generic_notification(event)
+
+    def _handle_session_configured(self, event: CodexEvent) -> None:
+        session_id = event.session_id
+        request_id = event.related_request_id
+        if not (session_id and request_id):
+            return
+
+        model = self._request_to_model.get(request_id)
+        if model:
+            self._sessions.bind_session_id(model, session_id)
+            LOG.info(
+                "Session configured: %s -> %s (req=%s)",
+                model.name,
+                session_id,
+                request_id,
+            )
 
     def _pane_for_event(self, event: CodexEvent) -> SessionPane | None:
         """Resolve which session pane should render a notification."""
@@ -638,7 +792,7 @@ class ParallelCodexApp(App[None]):
         message = payload.get("message") or payload.get("data") or "Working..."
 
         pct = self._percent_complete(progress, total)
-        safe_message = escape(str(message))
+        safe_message = _escaped_progress_message(str(message))
         pane.add_event_message(f"[bold yellow]PROGRESS[/] {pct}% {safe_message}")
 
     def _handle_logging_notification(self, event: CodexEvent) -> None:
@@ -648,10 +802,10 @@ class ParallelCodexApp(App[None]):
             return
 
         payload = self._notification_payload(event)
-        level = str(payload.get("level", "info")).upper()
+        prefix = _level_prefix(str(payload.get("level", "info")).upper())
         data = payload.get("data") or payload.get("message") or ""
         snippet = escape(self._truncate(str(data)))
-        pane.add_event_message(f"[cyan]{level}[/] {snippet}")
+        pane.add_event_message(prefix + snippet)
 
     def _handle_generic_notification(self, event: CodexEvent) -> None:
         """Render generic MCP notifications that are not classified as progress/logging."""
@@ -663,59 +817,60 @@ class ParallelCodexApp(App[None]):
 
         payload = self._notification_payload(event)
         msg_type = payload.get("type")
+        if not isinstance(msg_type, str):
+            return
+        handler = self._codex_msg_handlers.get(msg_type)
+        # Other events are ignored to prevent log noise as per user request.
+        if handler is not None:
+            handler(pane, payload)
 
-        # Specific event handling for Codex rich events
+    def _on_item_completed(self, pane: SessionPane, payload: dict) -> None:
         # We use item_completed because item_started often lacks the summary_text
         # info we need for the title.
-        if msg_type == "item_completed":
-            item = payload.get("item", {})
-            if item.get("type") == "Reasoning":
-                summary = item.get("summary_text")
-                if summary and isinstance(summary, list):
-                    # Clean up markdown bold markers if present for the title
-                    title_text = "".join(summary).strip().replace("**", "")
-                    pane.log_processing_event("", title=title_text)
-            return
-
-        if msg_type == "reasoning_content_delta":
-            delta = payload.get("delta")
-            if delta:
-                pane.update_reasoning(str(delta))
-            return
-
-        if msg_type == "exec_command_begin":
-            cmd = payload.get("command")
-            if isinstance(cmd, list):
-                cmd = " ".join(cmd)
-            pane.log_processing_event(f"[bold]Running:[/bold] {cmd}\n", title=f"Running '{cmd}'")
-            return
-
-        if msg_type == "exec_command_output_delta":
-            chunk = payload.get("chunk")
-            import base64
-            if chunk:
-                try:
-                    decoded = base64.b64decode(chunk).decode("utf-8", errors="replace")
-                    pane.log_processing_event(decoded)
-                except Exception:
-                    pane.log_processing_event(str(chunk))
-            return
-
-        if msg_type == "exec_command_end":
-            pane.log_processing_event("\n[bold]Command finished.[/bold]\n", title="Processing...")
-            return
-
-        if msg_type in ("agent_message_delta", "agent_message_content_delta"):
-            delta = payload.get("delta")
-            if delta:
-                pane.stream_assistant_chunk(str(delta))
-            return
-
-        # Fallback: Ignore other events to prevent log noise as per user request.
-        return
+        item = payload.get("item", {})
+        if item.get("type") == "Reasoning":
+            summary = item.get("summary_text")
+            if summary and isinstance(summary, list):
+                # Clean up markdown bold markers if present for the title
+                title_text = "".join(summary).strip().replace("**", "")
+                pane.log_processing_event("", title=title_text)
+
+    def _on_reasoning_delta(self, pane: SessionPane, payload: dict) -> None:
+        delta = payload.get("delta")
+        if delta:
+            pane.update_reasoning(str(delta))
+
+    def _on_exec_begin(self, pane: SessionPane, payload: dict) -> None:
+        cmd = payload.get("command")
+        if isinstance(cmd, list):
+            cmd = " ".join(cmd)
+        pane.log_processing_event(f"[bold]Running:[/bold] {cmd}\n", title=f"Running '{cmd}'")
+
+    def _on_exec_output(self, pane: SessionPane, payload: dict) -> None:
+        chunk = payload.get("chunk")
+        if chunk:
+            try:
+                # What base64.b64decode calls, minus its per-call wrapping.
+                decoded = binascii.a2b_base64(chunk).decode("utf-8", errors="replace")
+                pane.log_processing_event(decoded)
+            except Exception:
+                pane.log_processing_event(str(chunk))
+
+    def _on_exec_end(self, pane: SessionPane, payload: dict) -> None:
+        pane.log_processing_event("\n[bold]Command finished.[/bold]\n", title="Processing...")
+
+    def _on_agent_delta(self, pane: SessionPane, payload: dict) -> None:
+        delta = payload.get("delta")
+        if delta:
+            pane.stream_assistant_chunk(str(delta))
 
     @staticmethod
     def _percent_complete(progress: float | None, total: float | None) -> int:
+        if type(progress) is int and type(total) is int and total > 0:
+            # Progress counters from JSON are nearly always ints; integer math
+            # skips the float conversions. Both paths truncate the same value.
+            return max(0, min(100, progress * 100 // total))
+
         try:
             progress_val = float(progress if progress is not None else 0)
             total_val = float(total) if total not in (None, 0) else None
@@ -728,8 +883,8 @@ class ParallelCodexApp(App[None]):
         if total_val <= 0:
             return 0
 
-        ratio = max(0.0, min(1.0, progress_val / total_val))
-        return int(ratio * 100)
+        # Scale before dividing so exact ratios stay exact (29/100 -> 29, not 28).
+        return int(max(0.0, min(100.0, progress_val * 100 / total_val)))
 
     @staticmethod
     def _truncate(value: str, limit: int = 96) -> str:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import itertools
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -23,9 +24,11 @@ class SessionManager:
     """Tracks TUI sessions, their layout slots, and mapping to Codex ids."""
 
     def __init__(self) -> None:
+        # Insertion order doubles as the session order shown in the UI.
         self._sessions: dict[str, SessionModel] = {}
-        self._session_order: list[str] = []
         self._focused: str | None = None
+        # Codex session_id -> session name, kept in sync by bind_session_id().
+        self._names_by_session_id: dict[str, str] = {}
 
     # ------------------------------------------------------------------
     # CRUD
@@ -33,23 +36,22 @@ class SessionManager:
     def create_session(self, name: str) -> SessionModel:
         model = SessionModel(name=name)
         self._sessions[name] = model
-        self._session_order.append(name)
         if self._focused is None:
             self._focused = name
         return model
 
     def close_session(self, name: str) -> None:
-        self._sessions.pop(name, None)
-        if name in self._session_order:
-            self._session_order.remove(name)
+        model = self._sessions.pop(name, None)
+        if model is not None and model.session_id is not None:
+            self._names_by_session_id.pop(model.session_id, None)
         if self._focused == name:
-            self._focused = self._session_order[0] if self._session_order else None
+            self._focused = next(iter(self._sessions), None)
 
     def get(self, name: str) -> SessionModel | None:
         return self._sessions.get(name)
 
     def all_sessions(self) -> list[SessionModel]:
-        return [self._sessions[n] for n in self._session_order]
+        return list(self._sessions.values())
 
     # ------------------------------------------------------------------
     # Focus & mapping
@@ -59,18 +61,19 @@ class SessionManager:
             self._focused = name
 
     def focus_by_index(self, index: int) -> None:
-        if 0 <= index < len(self._session_order):
-            self._focused = self._session_order[index]
+        if 0 <= index < len(self._sessions):
+            self._focused = next(itertools.islice(self._sessions, index, None))
 
     def cycle_focus(self, *, forward: bool = True) -> None:
-        if not self._session_order or self._focused is None:
+        if not self._sessions or self._focused is None:
             return
-        current_idx = self._session_order.index(self._focused)
+        names = list(self._sessions)
+        current_idx = names.index(self._focused)
         if forward:
-            new_idx = (current_idx + 1) % len(self._session_order)
+            new_idx = (current_idx + 1) % len(names)
         else:
-            new_idx = (current_idx - 1) % len(self._session_order)
-        self._focused = self._session_order[new_idx]
+            new_idx = (current_idx - 1) % len(names)
+        self._focused = names[new_idx]
 
     @property
     def focused(self) -> SessionModel | None:
@@ -78,11 +81,19 @@ class SessionManager:
             return None
         return self._sessions.get(self._focused)
 
+    def bind_session_id(self, model: SessionModel, session_id: str) -> None:
+        """Record the Codex ``session_id`` assigned to ``model``."""
+
+        if model.session_id is not None:
+            self._names_by_session_id.pop(model.session_id, None)
+        model.session_id = session_id
+        self._names_by_session_id[session_id] = model.name
+
     def find_by_session_id(self, session_id: str) -> SessionModel | None:
-        for model in self._sessions.values():
-            if model.session_id == session_id:
-                return model
-        return None
+        name = self._names_by_session_id.get(session_id)
+        if name is None:
+            return None
+        return self._sessions.get(name)
 
 
 
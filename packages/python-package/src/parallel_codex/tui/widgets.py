@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
 from textual.app import ComposeResult
@@ -9,9 +10,22 @@ from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.css.query import NoMatches
 from textual.message import Message
 from textual.reactive import reactive
+from textual.timer import Timer
 from textual.widget import Widget
 from textual.widgets import Collapsible, Input, LoadingIndicator, Markdown, RichLog, Static
 
+# Event lines arriving closer together than this are mounted as one widget,
+# so a notification burst costs one layout pass per ~30 Hz frame.
+_EVENT_FLUSH_INTERVAL = 1 / 30
+
+# Final replies longer than this are rendered a slice at a time, yielding to
+# the event loop in between so keystrokes are not stuck behind the parse.
+_MARKDOWN_CHUNK_SIZE = 2048
+
+# Streamed assistant/reasoning deltas are re-rendered at most this often; each
+# render re-parses the whole message, so one per frame is plenty.
+_STREAM_FLUSH_INTERVAL = 1 / 30
+
 
 class UserMessage(Static):
     """Simple widget representing a user-entered message."""
@@ -34,6 +48,14 @@ class EventMessage(Static):
         super().__init__(text, markup=True, **kwargs)
 
 
+class PromptInput(Input):
+    """Per-session prompt input that remembers the pane that owns it."""
+
+    def __init__(self, pane: SessionPane, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.pane = pane
+
+
 class SessionPane(Vertical):
     """Pane that holds a scrollable history and its own input."""
 
@@ -57,13 +79,20 @@ class SessionPane(Vertical):
         self._active_loader: LoadingIndicator | None = None
         self._active_streaming_message: MarkdownMessage | None = None
         self._streaming_content: list[str] = []
+        self._pending_event_lines: list[str] = []
+        self._event_flush_timer: Timer | None = None
+        self._assistant_dirty = False
+        self._reasoning_dirty = False
+        self._stream_flush_timer: Timer | None = None
+        # Set while finish_processing_incrementally renders the final reply.
+        self._finalizing_reply = False
         self._refresh_border_title()
 
     def compose(self) -> ComposeResult:
         """Compose the scrollable message area and per-session input."""
 
         yield VerticalScroll(id=f"{self.id}-messages", classes="session-messages")
-        yield Input(placeholder="...", id=f"{self.id}-input", classes="session-input")
+        yield PromptInput(self, placeholder="...", id=f"{self.id}-input", classes="session-input")
 
     def _refresh_border_title(self) -> None:
         self.border_title = f"[bold]{self.label}[/bold]" if self.is_focused else self.label
@@ -84,6 +113,9 @@ class SessionPane(Vertical):
             return None
 
     def _append_message(self, widget: Widget) -> None:
+        if self._pending_event_lines:
+            # Keep buffered events ahead of whatever is appended after them.
+            self._flush_event_messages()
         messages = self._messages_container()
         messages.mount(widget)
         messages.scroll_end(animate=False)
@@ -124,7 +156,8 @@ class SessionPane(Vertical):
             self._processing_container.scroll_end(animate=False)
 
         self._current_block_text += delta
-        self._current_block_widget.update(self._current_block_text)
+        self._reasoning_dirty = True
+        self._schedule_stream_flush()
 
         if title and self._active_collapsible:
             self._active_collapsible.title = title
@@ -132,6 +165,8 @@ class SessionPane(Vertical):
     def log_processing_event(self, message: str, title: str | None = None) -> None:
         """Add a discrete event entry to the processing log."""
         # Break the current reasoning block if one exists
+        if self._reasoning_dirty:
+            self._flush_stream_updates()
         self._current_block_widget = None
         self._current_block_text = ""
 
@@ -147,12 +182,16 @@ class SessionPane(Vertical):
     def stream_assistant_chunk(self, chunk: str) -> None:
         """Stream content into the assistant's response message."""
 
+        if self._finalizing_reply:
+            return
         if self._active_streaming_message is None:
             # Create the message widget if it doesn't exist
             self._active_streaming_message = MarkdownMessage(
                 "", classes="message message-assistant"
             )
             # Insert it before the loader if possible, or just append
+            if self._pending_event_lines:
+                self._flush_event_messages()
             messages = self._messages_container()
             if self._active_loader:
                  # Mount before the loader so the loader stays at the bottom
@@ -162,13 +201,38 @@ class SessionPane(Vertical):
             messages.scroll_end(animate=False)
 
         self._streaming_content.append(chunk)
-        # Update the markdown content
-        full_text = "".join(self._streaming_content)
-        self._active_streaming_message.update(full_text)
-        self._messages_container().scroll_end(animate=False)
+        self._assistant_dirty = True
+        self._schedule_stream_flush()
+
+    def _schedule_stream_flush(self) -> None:
+        if self._stream_flush_timer is None:
+            self._stream_flush_timer = self.set_timer(
+                _STREAM_FLUSH_INTERVAL, self._flush_stream_updates
+            )
+
+    def _flush_stream_updates(self) -> None:
+        """Render the deltas streamed since the last frame."""
+
+        if self._stream_flush_timer is not None:
+            self._stream_flush_timer.stop()
+            self._stream_flush_timer = None
+        if self._reasoning_dirty:
+            self._reasoning_dirty = False
+            if self._current_block_widget is not None:
+                self._current_block_widget.update(self._current_block_text)
+        if self._assistant_dirty:
+            self._assistant_dirty = False
+            if self._active_streaming_message is not None:
+                self._active_streaming_message.update("".join(self._streaming_content))
+                self._messages_container().scroll_end(animate=False)
 
     def finish_processing(self, final_text: Any | None = None) -> None:
         """Complete the processing turn, remove loader, ensure final text is shown."""
+        if final_text is not None and self._active_streaming_message:
+            # The final text replaces the streamed message; skip the stale render.
+            self._assistant_dirty = False
+        self._flush_stream_updates()
+
         if self._active_loader:
             self._active_loader.remove()
             self._active_loader = None
@@ -189,6 +253,54 @@ class SessionPane(Vertical):
         self._active_streaming_message = None
         self._streaming_content = []
 
+    async def finish_processing_incrementally(self, final_text: Any) -> None:
+        """Like :meth:`finish_processing`, but render long replies in slices."""
+
+        text = _normalize_markdown_content(final_text)
+        if self._active_streaming_message is not None or len(text) <= _MARKDOWN_CHUNK_SIZE:
+            self.finish_processing(text)
+            return
+
+        # The final text supersedes anything streamed: drop pending deltas, and
+        # ignore new ones while the slices render, so no frame flush can paint
+        # partial streamed text over the reply.
+        self._discard_pending_stream()
+        self._finalizing_reply = True
+        try:
+            for chunk in _split_markdown(text, _MARKDOWN_CHUNK_SIZE):
+                await self.append_markdown(chunk)
+                await asyncio.sleep(0)
+        finally:
+            self._finalizing_reply = False
+            self._discard_pending_stream()
+        self.finish_processing()
+
+    def _discard_pending_stream(self) -> None:
+        if self._stream_flush_timer is not None:
+            self._stream_flush_timer.stop()
+            self._stream_flush_timer = None
+        self._assistant_dirty = False
+        self._streaming_content = []
+
+    async def append_markdown(self, chunk: str) -> None:
+        """Append a markdown fragment to the assistant's response message."""
+
+        if self._active_streaming_message is None:
+            self._active_streaming_message = MarkdownMessage(
+                "", classes="message message-assistant"
+            )
+            if self._pending_event_lines:
+                self._flush_event_messages()
+            messages = self._messages_container()
+            if self._active_loader:
+                await messages.mount(self._active_streaming_message, before=self._active_loader)
+            else:
+                await messages.mount(self._active_streaming_message)
+
+        # Markdown.append only re-parses from the last block, unlike update().
+        await self._active_streaming_message.append(chunk)
+        self._messages_container().scroll_end(animate=False)
+
     def add_user_message(self, text: str) -> None:
         self.ensure_thread_title(text)
         self._append_message(UserMessage(text, classes="message message-user"))
@@ -206,8 +318,33 @@ class SessionPane(Vertical):
         # want to log them differently. But if we have an active log, prefer that.
         if self._active_rich_log:
             self._active_rich_log.write(text)
-        else:
-            self._append_message(EventMessage(text, classes="message message-event"))
+            return
+
+        self._pending_event_lines.append(text)
+        if self._event_flush_timer is None:
+            self._event_flush_timer = self.set_timer(
+                _EVENT_FLUSH_INTERVAL, self._flush_event_messages
+            )
+
+    def _flush_event_messages(self) -> None:
+        """Mount all buffered event lines as a single message widget."""
+
+        if self._event_flush_timer is not None:
+            self._event_flush_timer.stop()
+            self._event_flush_timer = None
+        if not self._pending_event_lines:
+            return
+        text = "\n".join(self._pending_event_lines)
+        self._pending_event_lines = []
+        self._append_message(EventMessage(text, classes="message message-event"))
+
+    def set_provisioning(self, provisioning: bool) -> None:
+        """Show a loading overlay and disable the prompt while the session is set up."""
+
+        self.loading = provisioning
+        input_widget = self._input_widget()
+        if input_widget is not None:
+            input_widget.disabled = provisioning
 
     def focus_input(self) -> None:
         """Move keyboard focus into this session's input, if present."""
@@ -258,6 +395,24 @@ def _normalize_markdown_content(value: Any) -> str:
     return str(value)
 
 
+def _split_markdown(text: str, size: int) -> list[str]:
+    """Split ``text`` on line boundaries into pieces of roughly ``size`` chars."""
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for line in text.splitlines(keepends=True):
+        if current and current_len + len(line) > size:
+            chunks.append("".join(current))
+            current = []
+            current_len = 0
+        current.append(line)
+        current_len += len(line)
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
 def _generate_thread_title(prompt: str) -> str:
     """Derive a lightweight placeholder title from the first user prompt."""
 
@@ -96,11 +96,12 @@ def ensure_session_worktree(
     return SessionWorktree(session_name=session_name, branch_name=branch, path=target_dir)
 
 
-def _run_git(args: list[str], *, cwd: Path) -> subprocess.CompletedProcess[str]:
+def _run_git(args: list[str], *, cwd: Path) -> subprocess.CompletedProcess[bytes]:
+    # Output is captured to keep git quiet, but never parsed, so it is left as
+    # raw bytes rather than decoded through a text wrapper.
     return subprocess.run(
         ["git", *args],
         cwd=str(cwd),
-        text=True,
         check=True,
         capture_output=True,
     )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import sys
 from pathlib import Path
 
 import pytest
@@ -62,3 +64,35 @@ def test_explicit_command_argument_is_supported(monkeypatch: pytest.MonkeyPatch)
     args = parser.parse_args(["tui"])
 
     assert args.command == "tui"
+
+
+def test_event_loop_factory_falls_back_without_uvloop(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without uvloop installed the CLI defers to Textual's default event loop."""
+
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    assert cli._event_loop_factory() is None
+
+
+def test_main_runs_app_on_custom_loop_with_full_teardown(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A custom loop is torn down like asyncio.run(): executor shut down, tasks cancelled."""
+
+    loops: list[asyncio.AbstractEventLoop] = []
+    leftovers: list[asyncio.Task[None]] = []
+
+    def factory() -> asyncio.AbstractEventLoop:
+        loops.append(asyncio.new_event_loop())
+        return loops[-1]
+
+    async def fake_run_async(self: cli.ParallelCodexApp) -> None:
+        await asyncio.to_thread(lambda: None)
+        leftovers.append(asyncio.create_task(asyncio.sleep(60)))
+
+    monkeypatch.setattr(cli, "_event_loop_factory", lambda: factory)
+    monkeypatch.setattr(cli.ParallelCodexApp, "run_async", fake_run_async)
+
+    assert cli.main(["tui", "--repo", str(tmp_path)]) == 0
+    assert loops[0].is_closed()
+    assert leftovers[0].cancelled()
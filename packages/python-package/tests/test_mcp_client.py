@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
+import logging
+import signal
+import sys
 from typing import Any
 
 import pytest
 
+from parallel_codex import mcp_client
 from parallel_codex.mcp_client import (
     CodexEvent,
+    CodexEventTracker,
     CodexEventType,
     CodexMCP,
     PendingCall,
+    TrackedNotification,
     ensure_codex_present,
 )
 
@@ -21,7 +28,7 @@ class DummyStdout:
     def __init__(self) -> None:
         self._queue: asyncio.Queue[bytes] = asyncio.Queue()
 
-    async def readline(self) -> bytes:
+    async def read(self, n: int = -1) -> bytes:
         return await self._queue.get()
 
     async def push_json(self, payload: dict[str, Any]) -> None:
@@ -33,7 +40,7 @@ class DummyProc:
     def __init__(self, stdout: DummyStdout, stdin: Any) -> None:
         self.stdout = stdout
         self.stdin = stdin
-        self.stderr = None
+        self.stderr: Any = None
 
 
 class DummyStdin:
@@ -43,6 +50,9 @@ class DummyStdin:
     def write(self, data: bytes) -> None:
         self.writes.append(data)
 
+    def writelines(self, data: list[bytes]) -> None:
+        self.writes.append(b"".join(data))
+
     async def drain(self) -> None:
         pass
 
@@ -141,7 +151,7 @@ async def test_responses_published_to_global_queue(monkeypatch: pytest.MonkeyPat
 
     loop = asyncio.get_running_loop()
     future: asyncio.Future[dict[str, Any]] = loop.create_future()
-    client._pending[1] = PendingCall(
+    client._pending["1"] = PendingCall(
         request_id=1,
         method_name="codex",
         session_hint="session-123",
@@ -227,7 +237,7 @@ async def test_error_responses_reject_pending_calls(monkeypatch: pytest.MonkeyPa
 
     loop = asyncio.get_running_loop()
     future: asyncio.Future[dict[str, Any]] = loop.create_future()
-    client._pending[42] = PendingCall(
+    client._pending["42"] = PendingCall(
         request_id=42,
         method_name="codex",
         session_hint=None,
@@ -254,6 +264,11 @@ async def test_error_responses_reject_pending_calls(monkeypatch: pytest.MonkeyPa
         pass
 
 
+@pytest.fixture(autouse=True)
+def _clear_codex_path_cache() -> None:
+    mcp_client._which_codex.cache_clear()
+
+
 def test_ensure_codex_present_prefers_env_override(monkeypatch: pytest.MonkeyPatch) -> None:
     """If PARALLEL_CODEX_CODEX_PATH is set, it should be returned directly."""
 
@@ -352,7 +367,7 @@ async def test_prepare_codex_call_separates_id_and_sending() -> None:
     assert len(stdin.writes) == 0
 
     # Pending call should be registered
-    assert 1 in client._pending
+    assert "1" in client._pending
 
     # Now send it
     await send()
@@ -363,3 +378,743 @@ async def test_prepare_codex_call_separates_id_and_sending() -> None:
     assert sent_data["id"] == 1
     assert sent_data["method"] == "tools/call"
     assert sent_data["params"]["name"] == "codex"
+
+
+@pytest.mark.asyncio()
+async def test_reader_skips_malformed_and_blank_lines() -> None:
+    """Non-JSON and whitespace-only lines are ignored without stopping the reader."""
+
+    client = CodexMCP()
+    stdout = DummyStdout()
+    stdin = DummyStdin()
+    client._proc = DummyProc(stdout, stdin)  # type: ignore[assignment]
+    reader = asyncio.create_task(client._reader_loop())  # type: ignore[arg-type]
+
+    await stdout._queue.put(b"not json at all\n")
+    await stdout._queue.put(b"   \n")
+    await stdout.push_json(
+        {
+            "jsonrpc": "2.0",
+            "method": "notifications/progress",
+            "params": {"related_request_id": "req-7", "progress": 1, "total": 2},
+        }
+    )
+    await stdout._queue.put(b"")
+
+    event: CodexEvent = await asyncio.wait_for(client.get_global_event_queue().get(), timeout=1.0)
+    assert event.event_type == CodexEventType.PROGRESS
+    assert event.related_request_id == "req-7"
+
+    reader.cancel()
+    try:
+        await reader
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio()
+async def test_concurrent_sends_are_coalesced_into_one_write() -> None:
+    """Frames sent in the same event-loop tick share a single stdin write."""
+
+    client = CodexMCP()
+    stdout = DummyStdout()
+    stdin = DummyStdin()
+    client._proc = DummyProc(stdout, stdin)  # type: ignore[assignment]
+
+    sends = [client.prepare_codex_call(f"prompt {i}")[2] for i in range(4)]
+    await asyncio.gather(*(send() for send in sends))
+
+    assert len(stdin.writes) == 1
+    frames = stdin.writes[0].splitlines()
+    assert [json.loads(frame)["id"] for frame in frames] == [1, 2, 3, 4]
+
+    writer = client._writer_task
+    assert writer is not None
+    writer.cancel()
+    try:
+        await writer
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.asyncio()
+async def test_reader_reassembles_frames_split_across_reads() -> None:
+    """Frames may arrive split across, or batched within, a single pipe read."""
+
+    client = CodexMCP()
+    stdout = DummyStdout()
+    stdin = DummyStdin()
+    client._proc = DummyProc(stdout, stdin)  # type: ignore[assignment]
+    reader = asyncio.create_task(client._reader_loop())  # type: ignore[arg-type]
+
+    def frame(request_id: str) -> bytes:
+        payload = {
+            "jsonrpc": "2.0",
+            "method": "notifications/progress",
+            "params": {"related_request_id": request_id, "progress": 1, "total": 2},
+        }
+        return json.dumps(payload).encode("utf-8") + b"\n"
+
+    first, second, third = frame("a"), frame("b"), frame("c")
+    await stdout._queue.put(first[:10])
+    await stdout._queue.put(first[10:])
+    await stdout._queue.put(second + third[:7])
+    await stdout._queue.put(third[7:-1])
+    await stdout._queue.put(b"")
+
+    queue = client.get_global_event_queue()
+    seen = [(await asyncio.wait_for(queue.get(), timeout=1.0)).related_request_id for _ in range(3)]
+    assert seen == ["a", "b", "c"]
+
+    await asyncio.wait_for(reader, timeout=1.0)
+
+
+@pytest.mark.asyncio()
+async def test_tool_call_frame_matches_json_rpc_envelope() -> None:
+    """The precompiled request frame decodes to the full JSON-RPC request."""
+
+    client = CodexMCP()
+    stdin = DummyStdin()
+    client._proc = DummyProc(DummyStdout(), stdin)  # type: ignore[assignment]
+
+    _, _, send = client.prepare_reply("sess-1", 'say "hi"\nand \\ bye')
+    await send()
+
+    assert stdin.writes[0].endswith(b"\n")
+    assert json.loads(stdin.writes[0]) == {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {
+            "name": "codex-reply",
+            "arguments": {"prompt": 'say "hi"\nand \\ bye', "sessionId": "sess-1"},
+        },
+    }
+
+    writer = client._writer_task
+    assert writer is not None
+    writer.cancel()
+    try:
+        await writer
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_helpers_round_trip_with_and_without_orjson(
+    monkeypatch: pytest.MonkeyPatch,
+    use_orjson: bool,
+) -> None:
+    """Frames encode to compact bytes and decode from bytes on both JSON backends."""
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(mcp_client, "orjson", None)
+
+    payload = {"prompt": "héllo,\"quoted\"", "config": {"n": 1}}
+    encoded = mcp_client._dumps(payload)
+
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded
+    assert mcp_client._loads(encoded + b"\n") == payload
+    with pytest.raises(ValueError):
+        mcp_client._loads(b"{not json}\n")
+
+
+@pytest.mark.asyncio()
+async def test_session_configured_matches_request_id_before_fifo() -> None:
+    """session_configured binds to the correlated call, not the oldest waiting one."""
+
+    client = CodexMCP()
+    stdout = DummyStdout()
+    client._proc = DummyProc(stdout, DummyStdin())  # type: ignore[assignment]
+
+    first_id, _, _ = client.prepare_codex_call("first")
+    second_id, _, _ = client.prepare_codex_call("second")
+    first = client._pending[first_id]
+    second = client._pending[second_id]
+
+    reader = asyncio.create_task(client._reader_loop())  # type: ignore[arg-type]
+    await stdout.push_json(
+        {
+            "jsonrpc": "2.0",
+            "method": "session_configured",
+            "params": {
+                "_meta": {"requestId": int(second_id)},
+                "msg": {"type": "session_configured", "session_id": "sess-b"},
+            },
+        }
+    )
+    await stdout.push_json(
+        {
+            "jsonrpc": "2.0",
+            "method": "session_configured",
+            "params": {"msg": {"type": "session_configured", "session_id": "sess-a"}},
+        }
+    )
+    for _ in range(2):
+        await asyncio.wait_for(client.get_global_event_queue().get(), timeout=1.0)
+
+    assert second.session_hint == "sess-b"
+    assert first.session_hint == "sess-a"
+    assert not client._sessionless
+
+    reader.cancel()
+    try:
+        await reader
+    except asyncio.CancelledError:
+        pass
+
+
+def test_event_type_table_agrees_with_substring_rules() -> None:
+    """Fast-path method lookups classify exactly like the generic fallback."""
+
+    for method, expected in mcp_client._EVENT_TYPE_BY_METHOD.items():
+        lowered = method.lower()
+        if "progress" in lowered:
+            fallback = CodexEventType.PROGRESS
+        elif "logging" in lowered:
+            fallback = CodexEventType.LOGGING
+        elif "error" in lowered:
+            fallback = CodexEventType.ERROR
+        else:
+            fallback = CodexEventType.NOTIFICATION
+        assert expected is fallback, method
+
+    assert mcp_client._classify_event_type("notifications/Error") is CodexEventType.ERROR
+    assert mcp_client._classify_event_type(None) is CodexEventType.NOTIFICATION
+
+
+def test_parse_notification_prefers_meta_then_params_then_msg() -> None:
+    """Request ids resolve from _meta first, then params, then the nested msg."""
+
+    parse = mcp_client._parse_notification
+
+    assert parse(
+        {"params": {"_meta": {"requestId": 5}, "request_id": 6, "msg": {"session_id": "s"}}}
+    ) == ("5", "s")
+    assert parse({"params": {"request_id": 6, "msg": {"request_id": 7}}}) == ("6", None)
+    assert parse({"params": {"msg": {"related_request_id": 8, "session_id": "s"}}}) == ("8", "s")
+    assert parse({"params": {"session_id": "top"}}) == (None, "top")
+    assert parse({"method": "ping"}) == (None, None)
+    assert parse({"method": "ping", "params": ["positional"]}) == (None, None)
+
+
+def test_pre_encoded_tool_names_match_dumps() -> None:
+    for name, encoded in mcp_client._TOOL_NAME_JSON.items():
+        assert encoded == mcp_client._dumps(name)
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("level", [logging.DEBUG, logging.INFO])
+async def test_stderr_loop_logs_only_when_debug_enabled(
+    level: int, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Stderr lines reach the log at DEBUG and are drained silently otherwise."""
+
+    stderr = asyncio.StreamReader()
+    stderr.feed_data(b"first line\nsecond line\n")
+    stderr.feed_eof()
+
+    client = CodexMCP()
+    proc = DummyProc(DummyStdout(), DummyStdin())
+    proc.stderr = stderr
+    client._proc = proc  # type: ignore[assignment]
+
+    caplog.set_level(level, logger=mcp_client.LOG.name)
+    await asyncio.wait_for(client._stderr_loop(), timeout=1)
+
+    logged = [r.getMessage() for r in caplog.records if "stderr" in r.getMessage()]
+    if level == logging.DEBUG:
+        assert logged == [
+            "codex mcp-server stderr: first line",
+            "codex mcp-server stderr: second line",
+        ]
+    else:
+        assert logged == []
+    assert stderr.at_eof()
+
+
+def test_codex_event_keyword_defaults() -> None:
+    event = CodexEvent(raw={"method": "ping"})
+
+    assert event.session_id is None
+    assert event.is_notification is False
+    assert event.event_type is CodexEventType.NOTIFICATION
+    assert event.related_request_id is None
+    assert event.request_id is None
+    assert event.timestamp == 0.0
+
+
+def test_timeline_keeps_only_most_recent_notifications() -> None:
+    tracker = CodexEventTracker(max_notifications=3)
+
+    for index in range(5):
+        tracker.track_notification(
+            "1",
+            TrackedNotification(
+                event_type=CodexEventType.PROGRESS,
+                message={"index": index},
+                timestamp=float(index),
+            ),
+        )
+
+    timeline = tracker.get_request_timeline("1")
+    assert timeline is not None
+    assert [n.message["index"] for n in timeline.notifications] == [2, 3, 4]
+    assert timeline.notifications.maxlen == 3
+
+    tracker.track_outgoing_request(
+        "2", method="tools/call", params={}, session_hint=None, timestamp=0.0
+    )
+    outgoing = tracker.get_request_timeline("2")
+    assert outgoing is not None
+    assert outgoing.notifications.maxlen == 3
+
+
+@pytest.mark.asyncio()
+async def test_notify_writes_notification_without_pending_state() -> None:
+    client = CodexMCP()
+    stdin = DummyStdin()
+    client._proc = DummyProc(DummyStdout(), stdin)  # type: ignore[assignment]
+
+    await client.notify("notifications/cancelled", {"requestId": 3})
+    await client.notify("notifications/initialized")
+
+    assert [json.loads(frame) for frame in stdin.writes] == [
+        {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 3}},
+        {"jsonrpc": "2.0", "method": "notifications/initialized"},
+    ]
+    assert client._pending == {}
+    assert client._next_id == 1
+
+    writer = client._writer_task
+    assert writer is not None
+    writer.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await writer
+
+
+@pytest.mark.asyncio()
+async def test_coalescing_queue_keeps_latest_progress_per_request() -> None:
+    client = CodexMCP(coalesce_progress=True)
+    queue = client.get_global_event_queue()
+
+    def progress(rid: str, value: int) -> CodexEvent:
+        return CodexEvent(
+            raw={"value": value},
+            is_notification=True,
+            event_type=CodexEventType.PROGRESS,
+            related_request_id=rid,
+        )
+
+    queue.put_nowait(progress("1", 10))
+    queue.put_nowait(progress("1", 20))
+    queue.put_nowait(progress("2", 5))
+    queue.put_nowait(progress("1", 30))
+    queue.put_nowait(CodexEvent(raw={"value": 0}, related_request_id="1"))
+    queue.put_nowait(progress("1", 40))
+    queue.put_nowait(progress("1", 50))
+
+    drained = [queue.get_nowait().raw["value"] for _ in range(queue.qsize())]
+    assert drained == [20, 5, 30, 0, 50]
+    assert queue.empty()
+
+
+def test_coalescing_queue_keeps_progress_with_a_new_message() -> None:
+    queue = CodexMCP(coalesce_progress=True).get_global_event_queue()
+
+    def progress(value: int, message: str) -> CodexEvent:
+        return CodexEvent(
+            raw={"params": {"progress": value, "message": message}},
+            event_type=CodexEventType.PROGRESS,
+            related_request_id="1",
+        )
+
+    queue.put_nowait(progress(10, "Reading files"))
+    queue.put_nowait(progress(20, "Reading files"))
+    queue.put_nowait(progress(30, "Running tests"))
+    queue.put_nowait(progress(40, "Running tests"))
+
+    drained = [queue.get_nowait().raw["params"]["progress"] for _ in range(queue.qsize())]
+    assert drained == [20, 40]
+
+
+def test_progress_events_are_not_coalesced_by_default() -> None:
+    client = CodexMCP()
+    queue = client.get_global_event_queue()
+    for value in range(3):
+        queue.put_nowait(
+            CodexEvent(
+                raw={"value": value},
+                event_type=CodexEventType.PROGRESS,
+                related_request_id="1",
+            )
+        )
+
+    assert queue.qsize() == 3
+
+
+@pytest.mark.asyncio()
+async def test_untracked_requests_skip_notification_history() -> None:
+    client = CodexMCP()
+    global_queue = client.get_global_event_queue()
+    client._event_tracker.set_tracked("7", False)
+
+    client._handle_message(
+        {
+            "jsonrpc": "2.0",
+            "method": "codex/event",
+            "params": {"_meta": {"requestId": 7}, "msg": {"session_id": "sess-7"}},
+        },
+        1.0,
+    )
+
+    timeline = client.event_tracker.get_request_timeline("7")
+    assert timeline is not None
+    assert list(timeline.notifications) == []
+    assert timeline.session_id == "sess-7"
+    assert global_queue.qsize() == 1
+
+
+def test_pipe_buffer_size_is_clamped_to_kernel_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mcp_client, "_PIPE_BUFFER_SIZE", 1 << 40)
+
+    size = mcp_client._pipe_buffer_size()
+
+    if sys.platform == "linux":
+        with open("/proc/sys/fs/pipe-max-size", "rb") as handle:
+            assert size == int(handle.read())
+    else:
+        assert size == 1 << 40
+
+
+@pytest.mark.asyncio()
+@pytest.mark.skipif(sys.platform != "linux", reason="F_SETPIPE_SZ is Linux-only")
+async def test_grow_pipe_buffer_resizes_the_child_stdio_pipes() -> None:
+    import fcntl
+
+    size = min(256 * 1024, mcp_client._pipe_buffer_size())
+    # The child reports the buffer size of its own stdin/stdout pipes once told to.
+    script = (
+        "import fcntl, sys; sys.stdin.readline(); "
+        "print(fcntl.fcntl(0, fcntl.F_GETPIPE_SZ), fcntl.fcntl(1, fcntl.F_GETPIPE_SZ))"
+    )
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        script,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert proc.stdin is not None
+
+    mcp_client._grow_pipe_buffer(proc, 0, size)
+    mcp_client._grow_pipe_buffer(proc, 1, size)
+    stdin_pipe = proc.stdin.transport.get_extra_info("pipe")
+    assert fcntl.fcntl(stdin_pipe.fileno(), fcntl.F_GETPIPE_SZ) == size
+    stdout, _ = await proc.communicate(b"go\n")
+
+    assert [int(value) for value in stdout.split()] == [size, size]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="F_SETPIPE_SZ is Linux-only")
+def test_grow_pipe_buffer_keeps_default_without_a_subprocess_transport(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import fcntl
+
+    calls: list[Any] = []
+    monkeypatch.setattr(fcntl, "fcntl", lambda *args: calls.append(args))
+
+    class NoPipeTransport:
+        def get_pipe_transport(self, fd: int) -> None:
+            return None
+
+    proc = DummyProc(DummyStdout(), DummyStdin())
+    mcp_client._grow_pipe_buffer(proc, 1, 1 << 20)  # type: ignore[arg-type]
+    proc._transport = NoPipeTransport()  # type: ignore[attr-defined]
+    mcp_client._grow_pipe_buffer(proc, 1, 1 << 20)  # type: ignore[arg-type]
+
+    assert calls == []
+
+
+@pytest.mark.asyncio()
+async def test_backlogged_queues_evict_only_oldest_progress(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(mcp_client, "_GLOBAL_PROGRESS_BACKLOG", 2)
+    monkeypatch.setattr(mcp_client, "_SESSION_PROGRESS_BACKLOG", 2)
+    client = CodexMCP()
+    global_queue = client.get_global_event_queue()
+    session_queue = client.get_session_queue("s")
+
+    def notify(method: str, n: int) -> None:
+        client._handle_message(
+            {"jsonrpc": "2.0", "method": method, "params": {"session_id": "s", "n": n}},
+            0.0,
+        )
+
+    notify("session_configured", 0)
+    for n in range(1, 5):
+        notify("notifications/progress", n)
+    notify("codex/event", 5)
+    notify("codex/event", 6)
+
+    # The newest percentage survives the overflow; only progress is evicted.
+    for queue in (global_queue, session_queue):
+        assert [queue.get_nowait().raw["params"]["n"] for _ in range(queue.qsize())] == [
+            0,
+            4,
+            5,
+            6,
+        ]
+        assert queue.empty()
+    assert client._dropped_events == 6
+
+
+@pytest.mark.asyncio()
+async def test_full_session_queue_delivers_events_with_no_progress_to_evict(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(mcp_client, "_SESSION_PROGRESS_BACKLOG", 2)
+    client = CodexMCP()
+
+    for n in range(4):
+        client._handle_message(
+            {"jsonrpc": "2.0", "method": "codex/event", "params": {"session_id": "s", "n": n}},
+            0.0,
+        )
+
+    queue = client.get_session_queue("s")
+    assert [queue.get_nowait().raw["params"]["n"] for _ in range(4)] == [0, 1, 2, 3]
+    assert client._dropped_events == 0
+
+
+@pytest.mark.asyncio()
+async def test_session_queue_subscribed_late_sees_earlier_events() -> None:
+    client = CodexMCP()
+    client._handle_message(
+        {"jsonrpc": "2.0", "method": "session_configured", "params": {"session_id": "s"}},
+        0.0,
+    )
+    client._handle_message(
+        {"jsonrpc": "2.0", "method": "codex/event", "params": {"session_id": "s", "n": 1}},
+        0.0,
+    )
+
+    queue = client.get_session_queue("s")
+
+    assert [queue.get_nowait().raw["method"] for _ in range(queue.qsize())] == [
+        "session_configured",
+        "codex/event",
+    ]
+    event = CodexEvent(raw={"n": 2}, session_id="s", is_notification=True)
+    client._publish(queue, event, mcp_client._SESSION_PROGRESS_BACKLOG)
+    assert await asyncio.wait_for(queue.get(), timeout=1.0) is event
+
+
+def test_session_queues_can_be_disabled() -> None:
+    client = CodexMCP(session_queues=False)
+
+    client._handle_message(
+        {"jsonrpc": "2.0", "method": "codex/event", "params": {"session_id": "s"}},
+        0.0,
+    )
+
+    assert client._session_queues == {}
+
+
+def test_event_queue_eviction_keeps_fifo_order_and_task_count() -> None:
+    queue = mcp_client._EventQueue()
+
+    def event(n: int, event_type: CodexEventType) -> CodexEvent:
+        return CodexEvent(raw={"n": n}, event_type=event_type)
+
+    for n, event_type in enumerate(
+        [
+            CodexEventType.PROGRESS,
+            CodexEventType.NOTIFICATION,
+            CodexEventType.PROGRESS,
+            CodexEventType.PROGRESS,
+        ]
+    ):
+        queue.put_nowait(event(n, event_type))
+
+    assert queue.evict_oldest_progress()
+    assert queue.evict_oldest_progress()
+    assert queue.qsize() == 2
+    assert [e.raw["n"] for e in queue._queue] == [1, 3]
+
+    assert queue.get_nowait().raw["n"] == 1
+    queue.put_nowait(event(4, CodexEventType.PROGRESS))
+    assert queue.evict_oldest_progress()
+    assert queue.get_nowait().raw["n"] == 4
+    assert queue.empty()
+    assert not queue.evict_oldest_progress()
+
+    for _ in range(2):
+        queue.task_done()
+    # Every put was balanced by an eviction or a get() + task_done().
+    assert queue._unfinished_tasks == 0
+
+
+@pytest.mark.asyncio()
+@pytest.mark.parametrize("returncode", [0, 1])
+async def test_login_check_caches_success_only(
+    monkeypatch: pytest.MonkeyPatch, returncode: int
+) -> None:
+    monkeypatch.setattr(mcp_client, "_login_verified_until", {})
+    spawned: list[tuple[Any, ...]] = []
+
+    class FakeProc:
+        async def wait(self) -> int:
+            return returncode
+
+    async def fake_exec(*args: Any, **kwargs: Any) -> FakeProc:
+        spawned.append(args)
+        return FakeProc()
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", fake_exec)
+
+    for _ in range(2):
+        if returncode == 0:
+            await mcp_client.ensure_codex_logged_in("/opt/codex")
+        else:
+            with pytest.raises(RuntimeError, match="not authenticated"):
+                await mcp_client.ensure_codex_logged_in("/opt/codex")
+
+    assert len(spawned) == (1 if returncode == 0 else 2)
+
+
+def test_ensure_codex_present_caches_path_lookups(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PARALLEL_CODEX_CODEX_PATH", raising=False)
+    monkeypatch.setenv("PATH", "/first")
+    results = iter([None, "/first/codex", "/second/codex"])
+    calls: list[str] = []
+
+    def fake_which(cmd: str) -> str | None:
+        calls.append(cmd)
+        return next(results)
+
+    monkeypatch.setattr("parallel_codex.mcp_client.shutil.which", fake_which)
+
+    with pytest.raises(RuntimeError):
+        ensure_codex_present()
+    assert ensure_codex_present() == "/first/codex"
+    assert ensure_codex_present() == "/first/codex"
+    assert len(calls) == 2
+
+    monkeypatch.setenv("PATH", "/second")
+    assert ensure_codex_present() == "/second/codex"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio()
+async def test_global_events_are_not_buffered_without_a_subscriber() -> None:
+    client = CodexMCP()
+    client._pending["1"] = PendingCall(
+        request_id=1,
+        method_name="codex",
+        session_hint=None,
+        future=asyncio.get_running_loop().create_future(),
+    )
+
+    client._handle_message({"jsonrpc": "2.0", "method": "codex/event", "params": {}}, 0.0)
+    client._handle_message({"jsonrpc": "2.0", "id": 1, "result": {}}, 0.0)
+
+    assert client._global_events is None
+    assert client.get_global_event_queue().empty()
+
+
+def _process_is_running(pid: int) -> bool:
+    # A killed child reparented to a non-reaping init lingers as a zombie.
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            state = handle.read().rsplit(")", 1)[1].split()[0]
+    except FileNotFoundError:
+        return False
+    return state != "Z"
+
+
+@pytest.mark.asyncio()
+@pytest.mark.skipif(sys.platform != "linux", reason="inspects /proc")
+@pytest.mark.parametrize(
+    ("script", "expected_signal"),
+    [
+        # The whole group exits on SIGTERM within the grace period.
+        ("sleep 30 & echo $!; wait", signal.SIGTERM),
+        # Survivors of the grace period are killed.
+        ("trap '' TERM; sleep 30 & echo $!; wait", signal.SIGKILL),
+    ],
+)
+async def test_terminate_process_group_escalates_to_kill(
+    monkeypatch: pytest.MonkeyPatch, script: str, expected_signal: int
+) -> None:
+    monkeypatch.setattr(mcp_client, "_TERMINATE_GRACE_PERIOD", 0.3)
+    proc = await asyncio.create_subprocess_exec(
+        "sh", "-c", script, stdout=asyncio.subprocess.PIPE, start_new_session=True
+    )
+    assert proc.stdout is not None
+    child_pid = int(await proc.stdout.readline())
+
+    await mcp_client._terminate_process_group(proc, proc.pid)
+
+    assert proc.returncode == -expected_signal
+    for _ in range(50):
+        if not _process_is_running(child_pid):
+            break
+        await asyncio.sleep(0.01)
+    assert not _process_is_running(child_pid)
+
+
+@pytest.mark.asyncio()
+async def test_terminate_process_group_skips_exited_leader(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A reaped leader's pgid may have been reused, so it is never signalled."""
+
+    class ExitedProc(DummyProc):
+        returncode = 0
+
+        async def wait(self) -> int:
+            return 0
+
+    signalled: list[tuple[int, int]] = []
+    monkeypatch.setattr(mcp_client.os, "killpg", lambda pgid, sig: signalled.append((pgid, sig)))
+
+    proc = ExitedProc(DummyStdout(), DummyStdin())
+    await mcp_client._terminate_process_group(proc, 4242)  # type: ignore[arg-type]
+
+    assert signalled == []
+
+
+@pytest.mark.asyncio()
+async def test_sends_in_flight_fail_when_client_stops() -> None:
+    class StalledStdin(DummyStdin):
+        async def drain(self) -> None:
+            await asyncio.Event().wait()
+
+    class ExitedProc(DummyProc):
+        returncode = 0
+
+        async def wait(self) -> int:
+            return 0
+
+    client = CodexMCP()
+    client._proc = ExitedProc(DummyStdout(), StalledStdin())  # type: ignore[assignment]
+
+    # The first frame is stuck in drain(); the second waits in the outbox.
+    draining = asyncio.create_task(client._write_frame(b"first\n"))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(client._write_frame(b"second\n"))
+    await asyncio.sleep(0)
+
+    await client.stop()
+
+    for send in (draining, queued):
+        with pytest.raises(ConnectionResetError):
+            await asyncio.wait_for(send, timeout=1.0)
+    assert client._outbox == []
+    assert client._outbox_flushed is None
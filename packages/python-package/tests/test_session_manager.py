@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from parallel_codex.tui.session_manager import SessionManager
+
+
+def test_session_manager_indexes_sessions_by_codex_id() -> None:
+    manager = SessionManager()
+    first = manager.create_session("session-1")
+    manager.create_session("session-2")
+
+    manager.bind_session_id(first, "codex-a")
+    assert manager.find_by_session_id("codex-a") is first
+    assert first.session_id == "codex-a"
+
+    manager.bind_session_id(first, "codex-b")
+    assert manager.find_by_session_id("codex-a") is None
+    assert manager.find_by_session_id("codex-b") is first
+
+    manager.close_session("session-1")
+    assert manager.find_by_session_id("codex-b") is None
+
+
+def test_session_manager_keeps_creation_order() -> None:
+    manager = SessionManager()
+    for n in range(1, 4):
+        manager.create_session(f"session-{n}")
+
+    manager.focus_by_index(2)
+    assert manager.focused is manager.get("session-3")
+    manager.cycle_focus()
+    assert manager.focused is manager.get("session-1")
+    manager.cycle_focus(forward=False)
+    assert manager.focused is manager.get("session-3")
+
+    manager.close_session("session-3")
+    assert manager.focused is manager.get("session-1")
+    assert [m.name for m in manager.all_sessions()] == ["session-1", "session-2"]
@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import contextlib
+import io
+import logging
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from textual.widgets import Input, Log
+
+from parallel_codex.mcp_client import CodexEvent, CodexEventType
+from parallel_codex.tui import app as app_module
+from parallel_codex.tui.app import AppConfig, ParallelCodexApp, _TextualStreamTap
+from parallel_codex.worktrees import SessionWorktree, WorktreeError
+
+
+class FakePane:
+    """Stands in for a SessionPane and records the calls the app makes on it."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str]] = []
+
+    def start_processing(self) -> None:
+        self.calls.append(("start", ""))
+
+    def finish_processing(self, final_text: object | None = None) -> None:
+        self.calls.append(("finish", str(final_text)))
+
+    def add_event_message(self, text: str) -> None:
+        self.calls.append(("event", text))
+
+    def log_processing_event(self, message: str, title: str | None = None) -> None:
+        self.calls.append(("log", message))
+
+    def stream_assistant_chunk(self, chunk: str) -> None:
+        self.calls.append(("assistant", chunk))
+
+    def update_reasoning(self, delta: str) -> None:
+        self.calls.append(("reasoning", delta))
+
+
+@pytest.fixture()
+def app(tmp_path: Path) -> ParallelCodexApp:
+    return ParallelCodexApp(AppConfig(repo_root=tmp_path, agents_base=tmp_path))
+
+
+@pytest.fixture()
+def fake_pane(app: ParallelCodexApp) -> FakePane:
+    """Route every event in ``app`` to a recording pane."""
+
+    pane = FakePane()
+    app._pane_for_event = lambda event: pane  # type: ignore[assignment,method-assign,return-value]
+    return pane
+
+
+@pytest.fixture()
+def offline_app(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Callable[..., ParallelCodexApp]:
+    """Return a factory for apps that run without git worktrees or a codex server."""
+
+    def fake_worktree(repo_root: Path, agents_base: Path, session_name: str) -> SessionWorktree:
+        return SessionWorktree(session_name, f"agents/{session_name}", tmp_path / session_name)
+
+    async def noop() -> None:
+        return None
+
+    def make(
+        *,
+        worktree: Callable[[Path, Path, str], SessionWorktree] = fake_worktree,
+        show_log_panel: bool = False,
+    ) -> ParallelCodexApp:
+        monkeypatch.setattr(app_module, "ensure_session_worktree", worktree)
+        monkeypatch.setattr(app_module, "configure_logging", lambda: None)
+        app = ParallelCodexApp(
+            AppConfig(repo_root=tmp_path, agents_base=tmp_path, show_log_panel=show_log_panel)
+        )
+        monkeypatch.setattr(app._mcp, "start", noop)
+        monkeypatch.setattr(app._mcp, "stop", noop)
+        return app
+
+    return make
+
+
+@pytest.mark.asyncio()
+async def test_event_router_drains_queued_events_per_wakeup(
+    app: ParallelCodexApp, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app_module, "_ROUTER_BATCH_SIZE", 4)
+    routed: list[int] = []
+    app._route_event = lambda event: routed.append(event.raw["n"])  # type: ignore[method-assign]
+
+    queue = app._mcp.get_global_event_queue()
+    for n in range(6):
+        queue.put_nowait(CodexEvent(raw={"n": n}, is_notification=True))
+
+    router = asyncio.create_task(app._event_router())
+    await asyncio.sleep(0)
+    # One full batch, then the router yields before taking the rest.
+    assert routed == [0, 1, 2, 3]
+    await asyncio.sleep(0)
+    assert routed == [0, 1, 2, 3, 4, 5]
+    assert queue.empty()
+
+    router.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await router
+
+
+def test_route_event_dispatches_by_method_and_event_type(app: ParallelCodexApp) -> None:
+    handled: list[str] = []
+    app._event_handlers[CodexEventType.PROGRESS] = lambda event: handled.append("progress")
+    app._handle_generic_notification = (  # type: ignore[method-assign]
+        lambda event: handled.append("generic")
+    )
+
+    model = app._sessions.create_session("session-1")
+    app._request_to_model["1"] = model
+    app._route_event(
+        CodexEvent(
+            raw={"method": "session_configured"},
+            session_id="codex-a",
+            is_notification=True,
+            related_request_id="1",
+        )
+    )
+    app._route_event(
+        CodexEvent(raw={"method": "notifications/progress"}, event_type=CodexEventType.PROGRESS)
+    )
+    app._route_event(CodexEvent(raw={"method": "codex/event"}, is_notification=True))
+    app._route_event(CodexEvent(raw={"id": 1}, event_type=CodexEventType.RESPONSE))
+
+    assert app._sessions.find_by_session_id("codex-a") is model
+    assert handled == ["progress", "generic"]
+
+
+@pytest.mark.parametrize(
+    ("progress", "total", "expected"),
+    [
+        (29, 100, 29),
+        (3, 4, 75),
+        (5, 4, 100),
+        (-1, 4, 0),
+        (1.5, 3, 50),
+        ("2", "4", 50),
+        (40, None, 40),
+        (7, 0, 7),
+        (None, None, 0),
+        ("x", 4, 0),
+    ],
+)
+def test_percent_complete(progress: object, total: object, expected: int) -> None:
+    assert ParallelCodexApp._percent_complete(progress, total) == expected  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio()
+async def test_distinct_progress_messages_all_render(
+    app: ParallelCodexApp, fake_pane: FakePane
+) -> None:
+    app._mcp.get_global_event_queue()
+    for progress, message in [(1, "Reading files"), (2, "Reading files"), (3, "Running tests")]:
+        app._mcp._handle_message(
+            {
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {"request_id": 1, "progress": progress, "total": 4, "message": message},
+            },
+            0.0,
+        )
+    router = asyncio.create_task(app._event_router())
+    await asyncio.sleep(0)
+
+    router.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await router
+    # A burst collapses into its latest value, but each distinct message renders.
+    assert fake_pane.calls == [
+        ("event", "[bold yellow]PROGRESS[/] 50% Reading files"),
+        ("event", "[bold yellow]PROGRESS[/] 75% Running tests"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("progress", "total"),
+    [(29, 100), (57, 100), (1, 3), (2, 3), (1, 7), (5, 9), (13, 1000), (999, 1000), (7, 11)],
+)
+def test_percent_complete_int_and_float_paths_agree(progress: int, total: int) -> None:
+    expected = progress * 100 // total
+
+    assert ParallelCodexApp._percent_complete(progress, total) == expected
+    assert ParallelCodexApp._percent_complete(float(progress), float(total)) == expected
+    assert ParallelCodexApp._percent_complete(str(progress), str(total)) == expected  # type: ignore[arg-type]
+
+
+def test_level_prefix_escapes_markup() -> None:
+    assert app_module._level_prefix("INFO") == "[cyan]INFO[/] "
+    assert app_module._level_prefix("[/]") == "[cyan]\\[/][/] "
+
+
+@pytest.mark.asyncio()
+async def test_finished_event_tasks_are_pruned(app: ParallelCodexApp) -> None:
+    task = asyncio.create_task(asyncio.sleep(0))
+    app._track_task(task)
+    assert app._event_tasks == {task}
+
+    await task
+    await asyncio.sleep(0)
+    assert app._event_tasks == set()
+
+
+def test_result_content_only_falls_back_when_missing() -> None:
+    content = [{"type": "text", "text": "hi"}]
+    assert app_module._result_content({"content": content}) is content
+    assert app_module._result_content({"content": []}) == []
+    assert app_module._result_content({"isError": True}) == {"isError": True}
+
+
+def test_focus_session_action_takes_an_index(app: ParallelCodexApp) -> None:
+    app._sessions.create_session("session-1")
+    second = app._sessions.create_session("session-2")
+
+    app.action_focus_session(1)
+    assert app._sessions.focused is second
+
+    app.action_focus_session(5)
+    assert app._sessions.focused is second
+
+
+@pytest.mark.asyncio()
+async def test_on_shutdown_waits_for_cancelled_tasks(app: ParallelCodexApp) -> None:
+    stopped = asyncio.Event()
+
+    async def fake_stop() -> None:
+        stopped.set()
+
+    app._mcp.stop = fake_stop  # type: ignore[method-assign]
+    task = asyncio.create_task(asyncio.sleep(60))
+    app._track_task(task)
+
+    await app.on_shutdown()
+
+    assert task.cancelled()
+    assert stopped.is_set()
+
+
+@pytest.mark.asyncio()
+async def test_overflow_panes_are_hidden_and_promoted_on_close(
+    offline_app: Callable[..., ParallelCodexApp],
+) -> None:
+    app = offline_app()
+    async with app.run_test() as pilot:
+        for _ in range(4):
+            await app._ensure_session()
+        await pilot.pause()
+        shown = [name for name, pane in app._panes.items() if pane.display]
+        assert shown == ["session-1", "session-2", "session-3"]
+        assert app._hidden_panes == ["session-4", "session-5"]
+
+        app._sessions.focus("session-2")
+        app.action_close_session()
+        await pilot.pause()
+        assert app._panes["session-4"].display
+        assert app._hidden_panes == ["session-5"]
+
+        app._sessions.focus("session-5")
+        app.action_close_session()
+        assert app._hidden_panes == []
+
+
+@pytest.mark.asyncio()
+async def test_prompts_for_one_session_run_in_order(app: ParallelCodexApp) -> None:
+    model = app._sessions.create_session("session-1")
+    calls: list[tuple[str, str]] = []
+    release = asyncio.Event()
+
+    async def fake_call(model, pane, prompt, config) -> None:  # type: ignore[no-untyped-def]
+        calls.append(("codex", prompt))
+        await release.wait()
+        model.session_id = "codex-1"
+
+    async def fake_reply(model, pane, prompt) -> None:  # type: ignore[no-untyped-def]
+        calls.append(("codex-reply", prompt))
+
+    app._run_codex_call = fake_call  # type: ignore[method-assign]
+    app._run_codex_reply = fake_reply  # type: ignore[method-assign]
+
+    pane = FakePane()
+    app._enqueue_prompt(model, pane, "first")  # type: ignore[arg-type]
+    app._enqueue_prompt(model, pane, "second")  # type: ignore[arg-type]
+    await asyncio.sleep(0)
+    assert calls == [("codex", "first")]
+
+    release.set()
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert calls == [("codex", "first"), ("codex-reply", "second")]
+
+    await app.on_shutdown()
+    assert app._session_workers["session-1"].cancelled()
+
+
+@pytest.mark.asyncio()
+async def test_failed_prompt_shows_error_and_leaves_processing(app: ParallelCodexApp) -> None:
+    model = app._sessions.create_session("session-1")
+
+    async def failing_call(model, pane, prompt, config) -> None:  # type: ignore[no-untyped-def]
+        raise RuntimeError("server went away")
+
+    app._run_codex_call = failing_call  # type: ignore[method-assign]
+
+    pane = FakePane()
+    app._enqueue_prompt(model, pane, "hello")  # type: ignore[arg-type]
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert pane.calls == [("start", ""), ("finish", "Error: server went away")]
+    # The worker survives the failure and keeps serving the session.
+    assert not app._session_workers["session-1"].done()
+    await app.on_shutdown()
+
+
+@pytest.mark.asyncio()
+async def test_loop_watchdog_reports_blocking_work(
+    app: ParallelCodexApp, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(app_module, "_LOOP_WATCHDOG_INTERVAL", 0.01)
+    watchdog = asyncio.create_task(app._loop_watchdog())
+    await asyncio.sleep(0)
+
+    with caplog.at_level("WARNING", logger=app_module.__name__):
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+
+    watchdog.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await watchdog
+    assert any("Event loop blocked" in record.message for record in caplog.records)
+
+
+@pytest.mark.asyncio()
+async def test_worktree_setup_runs_off_the_event_loop(
+    tmp_path: Path, offline_app: Callable[..., ParallelCodexApp]
+) -> None:
+    release = threading.Event()
+
+    def slow_worktree(repo_root: Path, agents_base: Path, session_name: str) -> SessionWorktree:
+        if session_name == "session-3":
+            raise WorktreeError("boom")
+        if session_name != "session-1":
+            release.wait(5)
+        return SessionWorktree(session_name, f"agents/{session_name}", tmp_path / session_name)
+
+    app = offline_app(worktree=slow_worktree)
+
+    async with app.run_test() as pilot:
+        creating = asyncio.create_task(app._ensure_session())
+        await pilot.pause()
+        pane = app._panes["session-2"]
+        assert pane.query_one(Input).disabled
+        assert app._sessions.get("session-2").workspace_path is None  # type: ignore[union-attr]
+
+        release.set()
+        await creating
+        assert not pane.query_one(Input).disabled
+        assert app._sessions.get("session-2").workspace_path == tmp_path / "session-2"  # type: ignore[union-attr]
+
+        with pytest.raises(WorktreeError):
+            await app._ensure_session()
+        assert "session-3" not in app._panes
+        assert app._sessions.get("session-3") is None
+
+
+@pytest.mark.asyncio()
+async def test_dev_log_lines_are_written_in_batches(
+    offline_app: Callable[..., ParallelCodexApp], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app = offline_app(show_log_panel=True)
+
+    root_level = logging.getLogger().level
+    async with app.run_test() as pilot:
+        log = app.query_one("#dev-log", Log)
+        writes: list[int] = []
+        original = log.write_lines
+        monkeypatch.setattr(
+            log, "write_lines", lambda lines: writes.append(len(list(lines))) or original(lines)
+        )
+
+        for n in range(5):
+            app._submit_dev_log_line(f"loop line {n}")
+        worker = threading.Thread(target=app._submit_dev_log_line, args=("thread line",))
+        worker.start()
+        worker.join()
+        await pilot.pause(0.1)
+
+        # One widget update for the whole burst (other log records may share a tick).
+        assert 1 <= len(writes) < 6
+        assert sum(writes) >= 6
+        assert "thread line" in log.lines
+    logging.getLogger().setLevel(root_level)
+
+
+def test_stream_tap_splits_lines_across_writes(app: ParallelCodexApp) -> None:
+    emitted: list[str] = []
+    app._submit_dev_log_line = emitted.append  # type: ignore[method-assign]
+    passthrough = io.StringIO()
+    tap = _TextualStreamTap(app, passthrough, label="stdout")
+
+    tap.write("par")
+    tap.write("tial\r\nsecond\rthird\n\nfou")
+    assert emitted == ["[stdout] partial", "[stdout] second", "[stdout] third"]
+
+    tap.write("".join(f"{n}\n" for n in range(1000)))
+    assert len(emitted) == 1003
+    assert emitted[3] == "[stdout] fou0"
+
+    tap.write("tail")
+    tap.flush()
+    assert emitted[-1] == "[stdout] tail"
+    assert passthrough.getvalue().endswith("999\ntail")
+
+
+def test_exec_output_deltas_are_base64_decoded(app: ParallelCodexApp, fake_pane: FakePane) -> None:
+    def output(chunk: str) -> CodexEvent:
+        msg = {"type": "exec_command_output_delta", "chunk": chunk}
+        return CodexEvent(raw={"method": "codex/event", "params": {"msg": msg}})
+
+    app._handle_generic_notification(output(base64.b64encode("héllo\n".encode()).decode()))
+    app._handle_generic_notification(output("not base64!"))
+
+    assert fake_pane.calls == [("log", "héllo\n"), ("log", "not base64!")]
+
+
+def test_generic_notifications_dispatch_on_msg_type(
+    app: ParallelCodexApp, fake_pane: FakePane
+) -> None:
+    for msg in (
+        {"type": "agent_message_delta", "delta": "Hel"},
+        {"type": "agent_message_content_delta", "delta": "lo"},
+        {"type": "reasoning_content_delta", "delta": "hmm"},
+        {"type": "token_count"},
+        {"type": ["not", "hashable"]},
+    ):
+        app._handle_generic_notification(
+            CodexEvent(raw={"method": "codex/event", "params": {"msg": msg}})
+        )
+
+    assert fake_pane.calls == [("assistant", "Hel"), ("assistant", "lo"), ("reasoning", "hmm")]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from textual.app import App, ComposeResult
+
+from parallel_codex.tui.widgets import (
+    EventMessage,
+    MarkdownMessage,
+    PromptInput,
+    SessionPane,
+    UserMessage,
+    _split_markdown,
+)
+
+
+class PaneApp(App[None]):
+    """Minimal app hosting a single SessionPane."""
+
+    def compose(self) -> ComposeResult:
+        yield SessionPane("session-1")
+
+
+@pytest.mark.asyncio()
+async def test_session_pane_batches_event_messages() -> None:
+    async with PaneApp().run_test() as pilot:
+        pane = pilot.app.query_one(SessionPane)
+        for n in range(3):
+            pane.add_event_message(f"event {n}")
+        assert not pane.query(EventMessage)
+
+        await pilot.pause(0.1)
+        events = pane.query(EventMessage)
+        assert len(events) == 1
+        assert str(events.first().render()) == "event 0\nevent 1\nevent 2"
+
+        pane.add_event_message("before prompt")
+        pane.add_user_message("hello")
+        await pilot.pause()
+        kinds = [type(w) for w in pane.query("EventMessage, UserMessage")]
+        assert kinds == [EventMessage, EventMessage, UserMessage]
+
+
+def test_split_markdown_keeps_lines_whole() -> None:
+    text = "".join(f"line {n}\n" for n in range(500))
+    chunks = _split_markdown(text, 100)
+    assert "".join(chunks) == text
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert all(chunk.endswith("\n") for chunk in chunks)
+
+
+@pytest.mark.asyncio()
+async def test_session_pane_renders_long_reply_incrementally() -> None:
+    text = "".join(f"paragraph {n}\n\n" for n in range(300))
+    async with PaneApp().run_test() as pilot:
+        pane = pilot.app.query_one(SessionPane)
+        pane.start_processing()
+        await pane.finish_processing_incrementally([{"type": "text", "text": text}])
+        await pilot.pause()
+
+        messages = pane.query(MarkdownMessage)
+        assert len(messages) == 1
+        assert messages.first().source == text
+        assert pane._active_streaming_message is None
+
+
+@pytest.mark.asyncio()
+async def test_stream_delta_during_incremental_finish_does_not_clobber_reply() -> None:
+    text = "".join(f"paragraph {n}\n\n" for n in range(300))
+    async with PaneApp().run_test() as pilot:
+        pane = pilot.app.query_one(SessionPane)
+        pane.start_processing()
+        finishing = asyncio.create_task(pane.finish_processing_incrementally(text))
+        while pane._active_streaming_message is None:
+            await asyncio.sleep(0)
+        pane.stream_assistant_chunk("late partial delta")
+        await finishing
+        await pilot.pause(0.1)
+
+        messages = pane.query(MarkdownMessage)
+        assert len(messages) == 1
+        assert messages.first().source == text
+        assert pane._stream_flush_timer is None
+
+
+@pytest.mark.asyncio()
+async def test_session_pane_input_knows_its_pane() -> None:
+    async with PaneApp().run_test() as pilot:
+        pane = pilot.app.query_one(SessionPane)
+        assert pane.query_one(PromptInput).pane is pane
+
+
+@pytest.mark.asyncio()
+async def test_session_pane_renders_stream_deltas_once_per_frame() -> None:
+    async with PaneApp().run_test() as pilot:
+        pane = pilot.app.query_one(SessionPane)
+        pane.start_processing()
+        await pilot.pause()
+
+        updates: list[str] = []
+        for chunk in ("Hel", "lo ", "world"):
+            pane.stream_assistant_chunk(chunk)
+        message = pane.query_one(MarkdownMessage)
+        original = message.update
+        # Ignore the empty render Markdown does for itself when it mounts.
+        message.update = (  # type: ignore[method-assign]
+            lambda text: (updates.append(text) if text else None) or original(text)
+        )
+        pane.update_reasoning("thinking")
+        assert updates == []
+
+        await pilot.pause(0.1)
+        assert updates == ["Hello world"]
+
+        pane.stream_assistant_chunk("!")
+        pane.finish_processing("Final answer")
+        await pilot.pause(0.1)
+        assert updates == ["Hello world", "Final answer"]